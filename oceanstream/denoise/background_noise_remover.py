@@ -24,10 +24,18 @@ Note:
 - Sv = the volume backscattering strength
 
 """
+import warnings
+from typing import Dict
+
 import echopype as ep
 import numpy as np
 import xarray as xr
 
+# default range_sample_num of the dask-backed echo_range arrays seen so far,
+# by dask array name (a token of the array's data and graph)
+_RANGE_SAMPLE_NUMS: Dict[str, int] = {}
+_RANGE_SAMPLE_NUMS_MAX_SIZE = 32
+
 
 def apply_remove_background_noise(
     ds_Sv: xr.Dataset,
@@ -75,16 +83,7 @@ def apply_remove_background_noise(
 
     # Compute range_sample_num if not provided
     if range_sample_num is None:
-        range_sample_nums = []
-        for ch in range(ds_Sv.sizes["channel"]):
-            mean_diff = np.nanmean(np.diff(ds_Sv["echo_range"].isel(channel=ch).values[0, :]))
-            if np.isnan(mean_diff):
-                raise ValueError(
-                    "The default computed value for the range_sample_num is nan, please add the range_sample_num as input parameter"
-                )
-            range_sample_nums.append(int(10 / mean_diff))
-
-        range_sample_num = min(range_sample_nums)
+        range_sample_num = _default_range_sample_num(ds_Sv["echo_range"])
     # Remove noise
     ds_Sv_corrected = ep.clean.remove_noise(
         ds_Sv,
@@ -98,3 +97,40 @@ def apply_remove_background_noise(
     # Rename Sv_corrected to Sv
     ds_Sv_corrected = ds_Sv_corrected.rename({"Sv_corrected": "Sv"})
     return ds_Sv_corrected
+
+
+def _default_range_sample_num(echo_range: xr.DataArray) -> int:
+    """
+    Returns the number of samples in a 10-meter vertical bin, as the minimum across channels
+    of 10 m over the mean sample spacing of the first ping.
+
+    The results for dask-backed echo_range arrays are cached by their dask name,
+    so that calling apply_remove_background_noise again on the same dataset,
+    e.g. with other thresholds, does not read the first ping again.
+    """
+    dask_name = getattr(echo_range.data, "name", None)
+    if dask_name is not None and dask_name in _RANGE_SAMPLE_NUMS:
+        return _RANGE_SAMPLE_NUMS[dask_name]
+
+    # mean sample spacing of the first ping, for all channels at once
+    first_ping = echo_range.isel(ping_time=0).transpose("channel", ...).values
+    if first_ping.shape[-1] > 1 and np.isfinite(first_ping).all():
+        # without missing samples the mean of the differences is (last - first) / (n - 1)
+        mean_diffs = (first_ping[:, -1] - first_ping[:, 0]) / (first_ping.shape[-1] - 1)
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN channels
+            mean_diffs = np.nanmean(np.diff(first_ping, axis=-1), axis=-1)
+    if np.isnan(mean_diffs).any():
+        raise ValueError(
+            "The default computed value for the range_sample_num is nan, please add the range_sample_num as input parameter"
+        )
+    # rounded first, so that float noise in the spacing (e.g. 88.99999999999999 samples
+    # for an exact 89) does not decide the truncated number of samples
+    range_sample_num = int(np.round(10 / mean_diffs, 6).astype(int).min())
+
+    if dask_name is not None:
+        if len(_RANGE_SAMPLE_NUMS) >= _RANGE_SAMPLE_NUMS_MAX_SIZE:
+            _RANGE_SAMPLE_NUMS.clear()
+        _RANGE_SAMPLE_NUMS[dask_name] = range_sample_num
+    return range_sample_num
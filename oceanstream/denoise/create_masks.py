@@ -11,7 +11,7 @@ from echopype.clean.api import (
 )
 from echopype.mask.api import get_seabed_mask_multichannel
 
-from oceanstream.utils import add_metadata_to_mask, dict_to_formatted_list
+from oceanstream.utils import add_metadata_to_mask, as_bool_mask, dict_to_formatted_list
 
 from .types import DenoiseConfig
 
@@ -68,6 +68,7 @@ def create_and_add_metadata(create_mask_func, source_Sv, mask_type, config_item)
     mask = create_mask_func(
         source_Sv, parameters=config_item["parameters"], method=config_item["method"]
     )
+    mask = as_bool_mask(mask)
 
     return add_metadata_to_mask(
         mask=mask,
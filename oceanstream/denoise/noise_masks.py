@@ -4,10 +4,16 @@ noise_masks.py
 Description: Module for computing noise masks from Sv data.
 """
 
-
+import functools
+import operator
 import pathlib
-from typing import Union
+import threading
+import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Union
 
+import numpy as np
 import xarray as xr
 from echopype.clean.api import (
     get_attenuation_mask_multichannel,
@@ -16,7 +22,13 @@ from echopype.clean.api import (
 )
 from echopype.mask.api import get_seabed_mask_multichannel
 
-from oceanstream.utils import add_metadata_to_mask, attach_masks_to_dataset, dict_to_formatted_list
+from oceanstream.utils import (
+    add_metadata_to_mask,
+    as_bool_mask,
+    attach_masks_to_dataset,
+    dict_to_formatted_list,
+    pack_masks,
+)
 
 RAPIDKRILL_MASK_PARAMETERS = {
     "transient": {
@@ -147,6 +159,33 @@ MASK_PARAMETERS = {
 }
 
 
+_MASK_INPUT_VARIABLES = (
+    "Sv",
+    "frequency_nominal",
+    "echo_range",
+    "depth",
+    "angle_alongship",
+    "angle_athwartship",
+)
+
+
+def _open_if_path(Sv: Union[xr.Dataset, str, pathlib.Path]) -> xr.Dataset:
+    """
+    Opens a zarr or netCDF Sv file lazily, with dask chunks backed by the file,
+    so the masks stream the data instead of loading it all first,
+    keeping only the variables the masks use;
+    datasets are returned as they are
+    """
+    if not isinstance(Sv, (str, pathlib.Path)):
+        return Sv
+    if pathlib.Path(Sv).suffix == ".zarr":
+        Sv = xr.open_zarr(str(Sv), chunks="auto")
+    else:
+        Sv = xr.open_dataset(str(Sv), chunks="auto")
+    # the rest of a processed file (platform, environment, ...) is not read by the masks
+    return Sv[[name for name in _MASK_INPUT_VARIABLES if name in Sv.data_vars]]
+
+
 def create_transient_mask(
     Sv: Union[xr.Dataset, str, pathlib.Path], parameters: dict, method: str = "ryan"
 ):
@@ -171,6 +210,7 @@ def create_transient_mask(
     Example:
         >>> create_transient_mask(Sv, parameters, method)
     """
+    Sv = _open_if_path(Sv)
     mask = get_transient_noise_mask_multichannel(Sv, parameters, method)
     return mask
 
@@ -228,10 +268,15 @@ def create_attenuation_mask(
     Example:
         >>> create_attenuation_mask(Sv, parameters, method)
     """
+    Sv = _open_if_path(Sv)
     mask = get_attenuation_mask_multichannel(Sv, parameters, method)
     return mask
 
 
+_SPLIT_BEAM_SEABED_METHODS = frozenset({"blackwell", "blackwell_mod"})
+_SPLIT_BEAM_ANGLES = frozenset({"angle_alongship", "angle_athwartship"})
+
+
 def create_seabed_mask(Sv, parameters, method):
     """
     Invokes echopype's get_seabed_mask_multichannel
@@ -245,16 +290,110 @@ def create_seabed_mask(Sv, parameters, method):
         Default method parameters
 
     Returns:
-    - Multichannel mask for seabed detection
+    - Multichannel mask for seabed detection.
+    The "blackwell" and "blackwell_mod" methods need the split-beam angles;
+    without them a mask that keeps all the samples (True everywhere) is returned, with a warning.
 
     Example:
         >>> create_seabed_mask(Sv, parameters, method)
     """
+    Sv = _open_if_path(Sv)
+    if method in _SPLIT_BEAM_SEABED_METHODS and not _SPLIT_BEAM_ANGLES.issubset(Sv.data_vars):
+        warnings.warn(
+            f"Seabed method '{method}' needs split-beam angles, which are missing; "
+            "returning a seabed mask that keeps all the samples."
+        )
+        return xr.full_like(Sv["Sv"], True, dtype=bool)
     mask = get_seabed_mask_multichannel(Sv, parameters, method)
     return mask
 
 
-def create_mask(source_Sv: xr.Dataset, mask_type="impulse", params=MASK_PARAMETERS):
+MASK_FUNCTIONS = {
+    "transient": create_transient_mask,
+    "impulse": create_impulse_mask,
+    "attenuation": create_attenuation_mask,
+    "seabed": create_seabed_mask,
+    "false_seabed": create_seabed_mask,
+}
+
+
+# masks already computed with cache=True, keyed by
+# (Sv dataset key, mask type, method, frozen parameters) -> (Sv variable, mask).
+# In-memory datasets are keyed by id and their entries are dropped when they are
+# garbage collected, dask-backed ones by a token of their dask graph
+_MASK_CACHE: Dict[tuple, tuple] = {}
+_MASK_CACHE_SIZE = 32
+_MASK_CACHE_WATCHED = set()
+_MASK_CACHE_LOCK = threading.RLock()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _mask_cache_key(source_Sv, mask_type, method, parameters):
+    if getattr(source_Sv.get("Sv"), "chunks", None) is not None:
+        from dask.base import tokenize
+
+        # persist() and rechunking with the same chunks keep the dask names,
+        # so the token is the same for each call on the same data
+        sv_key = "dask-" + tokenize(source_Sv)
+    else:
+        sv_key = id(source_Sv)
+    key = (sv_key, mask_type, method, _freeze(parameters))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _cached_mask(source_Sv, key):
+    with _MASK_CACHE_LOCK:
+        cached = _MASK_CACHE.get(key)
+    if cached is None:
+        return None
+    # an in-memory dataset whose Sv was replaced since is not served the old mask
+    if isinstance(key[0], int) and cached[0] is not source_Sv.variables.get("Sv"):
+        return None
+    return cached[1].copy(deep=False)
+
+
+def _forget_masks(sv_id):
+    with _MASK_CACHE_LOCK:
+        for key in [key for key in _MASK_CACHE if key[0] == sv_id]:
+            del _MASK_CACHE[key]
+        _MASK_CACHE_WATCHED.discard(sv_id)
+
+
+def _remember_mask(source_Sv, key, mask):
+    with _MASK_CACHE_LOCK:
+        if isinstance(key[0], int) and key[0] not in _MASK_CACHE_WATCHED:
+            weakref.finalize(source_Sv, _forget_masks, key[0])
+            _MASK_CACHE_WATCHED.add(key[0])
+        if len(_MASK_CACHE) >= _MASK_CACHE_SIZE:
+            del _MASK_CACHE[next(iter(_MASK_CACHE))]
+        # the Sv variable is only compared for in-memory datasets, so dask-backed ones
+        # are not kept in memory by the cache
+        sv_variable = source_Sv.variables.get("Sv") if isinstance(key[0], int) else None
+        _MASK_CACHE[key] = (sv_variable, mask)
+
+
+def clear_mask_cache():
+    """
+    Forgets the masks created so far with cache=True.
+    """
+    with _MASK_CACHE_LOCK:
+        _MASK_CACHE.clear()
+
+
+def create_mask(
+    source_Sv: xr.Dataset, mask_type="impulse", params=MASK_PARAMETERS, cache: bool = False
+):
     """
     A function that creates a single noise mask for a given dataset
 
@@ -262,21 +401,25 @@ def create_mask(source_Sv: xr.Dataset, mask_type="impulse", params=MASK_PARAMETE
     - source_Sv (xarray.Dataset): the dataset to which the masks will be attached.
     - mask type (str): type of mask
     - params (dict): a dictionary of mask parameters containing type and
+    - cache (bool, optional): if True, a mask already created with cache=True for the same
+    dataset, mask type, method and parameters is returned instead of being created again,
+    e.g. when running the rapidkrill and oceanstream pipelines one after the other.
+    Up to 32 masks are kept until `clear_mask_cache` is called. Defaults to False.
 
     Returns:
     - xarray.DataArray: the required mask
     """
-    mask_map = {
-        "transient": create_transient_mask,
-        "impulse": create_impulse_mask,
-        "attenuation": create_attenuation_mask,
-        "seabed": create_seabed_mask,
-        "false_seabed": create_seabed_mask,
-    }
     method = params["method"]
     parameters = params["params"]
 
-    mask = mask_map[mask_type](source_Sv, parameters=parameters, method=method)
+    key = _mask_cache_key(source_Sv, mask_type, method, parameters) if cache else None
+    if key is not None:
+        cached = _cached_mask(source_Sv, key)
+        if cached is not None:
+            return cached
+
+    mask = MASK_FUNCTIONS[mask_type](source_Sv, parameters, method)
+    mask = as_bool_mask(mask)
     mask = add_metadata_to_mask(
         mask,
         metadata={
@@ -285,16 +428,57 @@ def create_mask(source_Sv: xr.Dataset, mask_type="impulse", params=MASK_PARAMETE
             "parameters": dict_to_formatted_list(parameters),
         },
     )
+    if key is not None:
+        _remember_mask(source_Sv, key, mask)
     return mask
 
 
-def create_multiple_masks(source_Sv: xr.Dataset, params=None):
+_PREFILTER_MASK_TYPES = ("transient", "impulse")
+_SEABED_MASK_TYPES = ("seabed", "false_seabed")
+
+
+def _create_masks(mask_Sv, mask_specs, max_workers=None, cache=False):
+    max_workers = len(mask_specs) if max_workers is None else min(max_workers, len(mask_specs))
+    if max_workers < 2:
+        return [create_mask(mask_Sv, *spec, cache=cache) for spec in mask_specs]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda spec: create_mask(mask_Sv, *spec, cache=cache), mask_specs))
+
+
+def create_multiple_masks(
+    source_Sv: xr.Dataset,
+    params=None,
+    chunks: Optional[Dict[str, int]] = None,
+    float32_Sv: bool = False,
+    packed: bool = False,
+    prefilter_seabed: bool = False,
+    max_workers: Optional[int] = None,
+    cache: bool = False,
+):
     """
     A function that creates multiple noise masks for a given Sv dataset
 
     Parameters:
     - source_Sv (xarray.Dataset): the dataset to which the masks will be attached.
     - params (dict): a dict of dictionaries of mask parameters
+    - chunks (dict, optional): dask chunks to split `source_Sv` into before creating the masks,
+    e.g. {"ping_time": 2048, "range_sample": -1}, so that large in-memory datasets are
+    processed tile by tile. Defaults to None (the dataset is used as it is).
+    - float32_Sv (bool, optional): if True, the masks are computed from a float32 copy
+    of a float64 `Sv`, which halves the memory traffic of the mask kernels.
+    The rounding is below 1e-5 dB, but can change pixels lying exactly at a threshold.
+    The returned dataset keeps the original `Sv`. Defaults to False.
+    - packed (bool, optional): if True, the masks are attached as the bits of a single
+    uint8 `mask_bits` variable (see `oceanstream.utils.pack_masks` and `unpack_mask`)
+    instead of one boolean variable each. Defaults to False.
+    - prefilter_seabed (bool, optional): if True, the transient and impulse masks are created
+    first and the seabed and false seabed masks are then created from an `Sv` where those
+    samples are set to NaN, so that the detectors don't work on known noise.
+    This can change the seabed masks. Defaults to False.
+    - max_workers (int, optional): maximum number of masks created at the same time
+    by a thread pool, 1 creates them one after the other, e.g. for debugging.
+    Defaults to None (one thread per mask).
+    - cache (bool, optional): passed on to `create_mask`. Defaults to False.
 
     Returns:
     - xarray.Dataset: a dataset with the same dimensions as the original,
@@ -306,9 +490,45 @@ def create_multiple_masks(source_Sv: xr.Dataset, params=None):
     it's essential that the `source_Sv` dataset includes the `split-beam angle` parameters.
     Specifically, ensure that your input `source_Sv` contains
     both the `angle_alongship` and `angle_athwartship` variables.
-    Absence of these variables leads to errors .
+    Without them, these methods give a mask that keeps all the samples, with a warning.
+    - The masks only read `source_Sv`, so they are created concurrently in threads.
+    - A dask-backed `source_Sv` (e.g. opened from zarr) is persisted first,
+    so that its data is read once for all the masks instead of once per mask.
     """
-    masks = [create_mask(source_Sv, mask_type=k, params=params[k]) for k in params.keys()]
+    if chunks is not None:
+        source_Sv = source_Sv.chunk({dim: n for dim, n in chunks.items() if dim in source_Sv.dims})
+    downcast = float32_Sv and source_Sv["Sv"].dtype == np.float64
+    mask_Sv = source_Sv.assign(Sv=source_Sv["Sv"].astype(np.float32)) if downcast else source_Sv
+    if len(params) > 1 and getattr(mask_Sv.get("Sv"), "chunks", None) is not None:
+        mask_Sv = mask_Sv.persist()
+        if not downcast:
+            source_Sv = mask_Sv
+
+    mask_specs = list(params.items())
+    noise_specs = [spec for spec in mask_specs if spec[0] in _PREFILTER_MASK_TYPES]
+    seabed_specs = [spec for spec in mask_specs if spec[0] in _SEABED_MASK_TYPES]
+    if prefilter_seabed and noise_specs and seabed_specs:
+        other_specs = [spec for spec in mask_specs if spec not in seabed_specs]
+        created = dict(
+            zip(
+                (spec[0] for spec in other_specs),
+                _create_masks(mask_Sv, other_specs, max_workers, cache),
+            )
+        )
+        # masks are True where a sample is kept, so only samples kept by all of them remain
+        keep = functools.reduce(operator.and_, (created[spec[0]] for spec in noise_specs))
+        clean_Sv = mask_Sv.assign(Sv=mask_Sv["Sv"].where(keep))
+        created.update(
+            zip(
+                (spec[0] for spec in seabed_specs),
+                _create_masks(clean_Sv, seabed_specs, max_workers, cache),
+            )
+        )
+        masks = [created[mask_type] for mask_type, _ in mask_specs]
+    else:
+        masks = _create_masks(mask_Sv, mask_specs, max_workers, cache)
+    if packed:
+        return source_Sv.assign(mask_bits=pack_masks(masks))
     Sv_mask = attach_masks_to_dataset(source_Sv, masks)
     return Sv_mask
 
@@ -331,7 +551,7 @@ def create_noise_masks_rapidkrill(source_Sv: xr.Dataset, params=RAPIDKRILL_MASK_
     it's essential that the `source_Sv` dataset includes the `split-beam angle` parameters.
     Specifically, ensure that your input `source_Sv` contains
     both the `angle_alongship` and `angle_athwartship` variables.
-    Absence of these variables leads to errors .
+    Without them, these methods give a mask that keeps all the samples, with a warning.
     """
     Sv_mask = create_multiple_masks(source_Sv, params)
     return Sv_mask
@@ -356,7 +576,7 @@ def create_default_noise_masks_oceanstream(
     it's essential that the `source_Sv` dataset includes the `split-beam angle` parameters.
     Specifically, ensure that your input `source_Sv` contains
     both the `angle_alongship` and `angle_athwartship` variables.
-    Absence of these variables leads to errors .
+    Without them, these methods give a mask that keeps all the samples, with a warning.
     """
     Sv_mask = create_multiple_masks(source_Sv, params)
     return Sv_mask
@@ -381,12 +601,17 @@ def create_seabed_masks_oceanstream(
     return Sv_mask
 
 
-def create_noise_masks_oceanstream(source_Sv: xr.Dataset, params=OCEANSTREAM_NOISE_MASK_PARAMETERS):
+def create_noise_masks_oceanstream(
+    source_Sv: xr.Dataset,
+    params=OCEANSTREAM_NOISE_MASK_PARAMETERS,
+    chunks: Optional[Dict[str, int]] = None,
+):
     """
     A function that creates noise masks for a given Sv dataset using default methods for oceanstream
 
     Parameters:
     - source_Sv (xarray.Dataset): the dataset to which the masks will be attached.
+    - chunks (dict, optional): dask chunks for `source_Sv`, see `create_multiple_masks`.
 
     Returns:
     - xarray.Dataset: a dataset with the same dimensions as the original,
@@ -394,5 +619,5 @@ def create_noise_masks_oceanstream(source_Sv: xr.Dataset, params=OCEANSTREAM_NOI
     mask_attenuated
 
     """
-    Sv_mask = create_multiple_masks(source_Sv, params)
+    Sv_mask = create_multiple_masks(source_Sv, params, chunks=chunks)
     return Sv_mask
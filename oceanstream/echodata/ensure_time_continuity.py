@@ -10,12 +10,12 @@ beam group and time dimension
 and time dimensions associated.
 """
 
+import numpy as np
 import xarray as xr
-from echopype.qc.api import coerce_increasing_time, exist_reversed_time
 
 DEFAULT_TIME_DICT = {"Sonar/Beam_group1": "ping_time"}
-DEFAULT_DIMENSION = list(DEFAULT_TIME_DICT.keys())[0]
-DEFAULT_TIME_NAME = DEFAULT_TIME_DICT.get(DEFAULT_DIMENSION)
+DEFAULT_DIMENSION = next(iter(DEFAULT_TIME_DICT))
+DEFAULT_TIME_NAME = DEFAULT_TIME_DICT[DEFAULT_DIMENSION]
 
 
 def check_reversed_time(
@@ -40,10 +40,18 @@ def check_reversed_time(
     Expected Output
     False
     """
-    has_reversal = exist_reversed_time(ds=ed[dimension], time_name=time_name)
+    has_reversal = _has_reversed_time(ed[dimension][time_name].values)
     return has_reversal
 
 
+def _has_reversed_time(time_values: np.ndarray) -> bool:
+    """
+    Checks whether a datetime64 array contains any backwards jump in time,
+    working directly on the numpy buffer instead of the xarray coordinate.
+    """
+    return bool((np.diff(time_values) < np.timedelta64(0, "ns")).any())
+
+
 def fix_time_reversions(er: xr.Dataset, time_dict=None, win_len: int = 100):
     """
     Fixes reversed timestamps in an unprocessed EK60/80 data file
@@ -68,8 +76,13 @@ def fix_time_reversions(er: xr.Dataset, time_dict=None, win_len: int = 100):
     if time_dict is None:
         time_dict = DEFAULT_TIME_DICT
     for dim, time in time_dict.items():
-        if check_reversed_time(er, dim, time):
-            coerce_increasing_time(er[dim], time, win_len)
+        ds_sub = er[dim]
+        if _has_reversed_time(ds_sub[time].values):
+            # imported only when a reversal has to be fixed
+            from echopype.qc.api import coerce_increasing_time
+
+            # coerce_increasing_time modifies the group in place
+            coerce_increasing_time(ds_sub, time, win_len)
     return er
 
 
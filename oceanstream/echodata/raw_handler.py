@@ -22,17 +22,139 @@ the similarity between two consecutive files.
 """
 
 # Import necessary libraries
+import functools
 import os
+import pickle
+import queue
 import re
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-from typing import Dict, List, Union
-
-import echopype as ep
-from echopype.convert.utils.ek_raw_io import RawSimradFile
+import sqlite3
+import struct
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, TypedDict, Union
+from urllib.parse import urlparse
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # echopype is slow to import, so it is only loaded by the functions that need it
+    import echopype as ep
 
 SUPPORTED_SONAR_MODELS = ["EK60", "ES70", "EK80", "EA640", "AZFP", "AD2CP"]
 TIME_BETWEEN_FILES = 30  # time in minutes between two consecutive files
+# start date and time of the measurement, as in JR161-D20230509-T100645.raw,
+# with the field ranges checked by the pattern rather than by datetime raising
+_FILE_NAME_DATE_RE = re.compile(
+    r"D(\d{4})(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])-T([01]\d|2[0-3])([0-5]\d)([0-5]\d)"
+)
+# largest configuration datagram read directly from the start of a raw file, in bytes
+CONFIG_DATAGRAM_MAX_SIZE = 16 * 1024 * 1024
+# target size of the netCDF chunks chosen by _write_file,
+# within the default 1 MiB chunk cache of HDF5
+NETCDF_CHUNK_BYTES = 1024 * 1024
+# dask chunks of the raw files combined by concatenate_files
+RAW_CONCAT_CHUNKS = {"ping_time": 2048}
+# header of the EK60 configuration datagram: type, low/high NT date, survey, transect,
+# sounder name, version, spare and transceiver count
+_CON0_HEADER = struct.Struct("=4sLL128s128s128s30s98sl")
+_NT_EPOCH = datetime(1601, 1, 1, tzinfo=timezone.utc)
+# application name in the Header element of the EK80 configuration XML
+_APPLICATION_NAME_RE = re.compile(r"<Header\b[^>]*?\bApplicationName\s*=\s*[\"']([^\"']*)[\"']")
+# on-disk cache for the metadata read from raw file headers, disabled by default;
+# set it to a path such as DEFAULT_METADATA_CACHE_PATH to reuse the metadata across runs
+DEFAULT_METADATA_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".oceanstream", "metadata_cache.sqlite"
+)
+METADATA_CACHE_PATH: Optional[str] = None
+# fsspec options for the files opened directly from remote URLs, per URL scheme:
+# large read-ahead blocks, so that the many small reads of a file share a few range requests
+REMOTE_BLOCK_SIZE = 16 * 1024 * 1024
+_OBJECT_STORE_OPTIONS = {"default_cache_type": "readahead", "default_block_size": REMOTE_BLOCK_SIZE}
+_REMOTE_STORAGE_OPTIONS: Dict[str, Dict] = {
+    "s3": _OBJECT_STORE_OPTIONS,
+    "gs": _OBJECT_STORE_OPTIONS,
+    "gcs": _OBJECT_STORE_OPTIONS,
+    "http": {"block_size": REMOTE_BLOCK_SIZE},
+    "https": {"block_size": REMOTE_BLOCK_SIZE},
+}
+
+
+class FileInfo(TypedDict, total=False):
+    file_path: str
+    campaign_id: Optional[str]
+    date: Optional[datetime]
+    file_integrity: bool
+    sonar_model: Optional[str]
+    use_swap: bool
+
+
+def _cache_on_disk(func):
+    """
+    Caches the results of a function taking a file path in a sqlite database
+    at METADATA_CACHE_PATH, keyed by the path, modification time and size of the file.
+    Results are recomputed whenever the file has changed on disk.
+    Nothing is cached while METADATA_CACHE_PATH is None, which is the default.
+    None results are not cached, so files whose headers cannot be read are tried again.
+    Failures to read or write the cache are ignored.
+    """
+
+    @functools.wraps(func)
+    def wrapper(file_path: str, *args, **kwargs):
+        cache_path = METADATA_CACHE_PATH
+        if cache_path is None:
+            return func(file_path, *args, **kwargs)
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            # remote URLs are not cached
+            return func(file_path, *args, **kwargs)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with closing(sqlite3.connect(cache_path)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta "
+                    "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, payload BLOB)"
+                )
+                row = conn.execute(
+                    "SELECT mtime, size, payload FROM meta WHERE path = ?", (file_path,)
+                ).fetchone()
+        except (OSError, sqlite3.Error):
+            return func(file_path, *args, **kwargs)
+
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return pickle.loads(row[2])
+
+        result = func(file_path, *args, **kwargs)
+        if result is None:
+            return result
+        try:
+            with closing(sqlite3.connect(cache_path)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?)",
+                    (file_path, stat.st_mtime_ns, stat.st_size, pickle.dumps(result)),
+                )
+        except sqlite3.Error:
+            pass
+        return result
+
+    return wrapper
+
+
+def _is_zarr_root(directory: str) -> bool:
+    """
+    Checks if a directory is the root of a zarr dataset.
+    Directories that cannot be listed are not.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return any(entry.name.endswith((".zarray", ".zgroup")) for entry in entries)
+    except OSError:
+        return False
 
 
 def _find_zarr_root_directories(paths: Union[str, List[str]]) -> List[str]:
@@ -50,15 +172,6 @@ def _find_zarr_root_directories(paths: Union[str, List[str]]) -> List[str]:
     """
     zarr_roots = []
 
-    def is_zarr_root(directory: str) -> bool:
-        """
-        Checks if a directory is the root of a zarr dataset.
-        """
-        return any(
-            fname.endswith(".zarray") or fname.endswith(".zgroup")
-            for fname in os.listdir(directory)
-        )
-
     if isinstance(paths, str):
         if not os.path.isdir(paths):
             raise ValueError(f"Path {paths} is not a valid directory.")
@@ -72,7 +185,7 @@ def _find_zarr_root_directories(paths: Union[str, List[str]]) -> List[str]:
 
     for path in search_paths:
         for root, dirs, _ in os.walk(path):
-            if is_zarr_root(root):
+            if _is_zarr_root(root):
                 zarr_roots.append(root)
                 dirs[:] = []  # Skip subdirectories to avoid nested zarr datasets
 
@@ -115,37 +228,105 @@ def file_finder(paths: Union[str, List[str]], file_type: str = "raw") -> List[st
     ['/path/to/file1.raw', '/path/to/file2.raw']
     """
     if file_type == "zarr" or file_type == ".zarr":
-        zarr_files = _find_zarr_root_directories(paths)
-        if isinstance(paths, str):
-            # Filter out subdirectory paths
-            zarr_files = [f for f in zarr_files if os.path.dirname(f) == paths]
-        return sorted(zarr_files)
-
-    if isinstance(paths, str) and os.path.isdir(paths):
-        ret_files = [
-            os.path.join(paths, f_p)
-            for f_p in os.listdir(paths)
-            if os.path.isfile(os.path.join(paths, f_p))
-        ]
-        ret_files = file_finder(ret_files, file_type)
+        if isinstance(paths, str) and os.path.isdir(paths):
+            # only the direct subdirectories can match, so the tree is not walked;
+            # like os.walk, symlinked directories are not followed and unreadable ones are skipped
+            try:
+                with os.scandir(paths) as entries:
+                    return sorted(
+                        entry.path
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False) and _is_zarr_root(entry.path)
+                    )
+            except OSError:
+                return []
+        return _find_zarr_root_directories(paths)
+
+    suffix = "." + file_type.lstrip(".")
+    if isinstance(paths, str):
+        # the directory listing already tells whether an entry is a file,
+        # so the matches are sorted once here without further checks.
+        # scandir fails for anything but a directory, so it is not checked beforehand
+        try:
+            with os.scandir(paths) as entries:
+                return sorted(
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(suffix) and entry.is_file()
+                )
+        except OSError:
+            # missing paths, files and directories that cannot be read
+            pass
     elif isinstance(paths, list):
-        ret_files = []
-        for elem in paths:
-            if "." + file_type in elem and os.path.isfile(elem):
-                ret_files.append(elem)
-    else:
-        raise ValueError(
-            "Invalid input. Provide either a directory\
-             path or a list of file paths."
-        )
+        # the cheap suffix test comes first, so only matching paths are checked on disk
+        ret_files = [elem for elem in paths if elem.endswith(suffix) and os.path.isfile(elem)]
+        return sorted(ret_files)
+
+    raise ValueError(
+        "Invalid input. Provide either a directory\
+         path or a list of file paths."
+    )
+
+
+class _FileNameParts(NamedTuple):
+    file_name: str
+    stem: str
+    extension: str
+    campaign_id: str
+    date: Optional[datetime]
+
+
+def _storage_options(file_path: str, storage_options: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Returns the fsspec storage options used to open the given remote URL:
+    the defaults for its scheme, updated with the given storage options
+    (e.g. credentials or anon=True). Returns None for local paths.
+    """
+    if "://" not in file_path:
+        return None
+    options = dict(_REMOTE_STORAGE_OPTIONS.get(urlparse(file_path).scheme.lower(), {}))
+    options.update(storage_options or {})
+    return options
+
 
-    return sorted(ret_files)
+@functools.lru_cache(maxsize=65536)
+def _file_name_parts(file_path: str) -> _FileNameParts:
+    """
+    Splits a file path into the parts used throughout this module, so that
+    a path passed from one function to the next is only parsed once.
+    The extension is lower case and trailing separators of zarr directory paths are ignored.
+    """
+    file_name = os.path.basename(file_path.rstrip("/\\"))
+    stem, extension = os.path.splitext(file_name)
+    return _FileNameParts(
+        file_name=file_name,
+        stem=stem,
+        extension=extension.lower(),
+        campaign_id=file_name.split("-")[0],
+        date=_date_from_file_name(file_name),
+    )
+
+
+def _date_from_file_name(file_name: str) -> Optional[datetime]:
+    """
+    Returns the start date and time of the measurement encoded in a file name
+    such as JR161-D20230509-T100645.raw, or None if there is no valid one.
+    """
+    match = _FILE_NAME_DATE_RE.search(file_name)
+    if match is None:
+        return None
+    try:
+        return datetime(*map(int, match.groups()))
+    except ValueError:
+        # days that do not exist in the month, e.g. 20230230
+        return None
 
 
 def file_integrity_checking(
     file_path: str,
     use_swap: bool = False,
-) -> Dict[str, Union[str, datetime, bool]]:  # noqa: E501
+    storage_options: Optional[Dict] = None,
+) -> FileInfo:  # noqa: E501
     """
     Checks the integrity of a given echo sounder file.
 
@@ -157,11 +338,15 @@ def file_integrity_checking(
 
     Parameters:
 
-    - file_path (str): Absolute path to the echo sounder file.
+    - file_path (str): Absolute path to the echo sounder file,\
+    or a remote URL such as s3://bucket/JR161-D20230509-T100645.raw.
     - use_swap (bool, optional): Parameter specific to the echopype library `open_raw` function. Defaults to False\
       If True, variables with a large memory footprint will be written to a temporary zarr store at \
       ``~/.echopype/temp_output/parsed2zarr_temp_files``\
       Relevant only for raw files.
+    - storage_options (dict, optional): fsspec options for remote URLs, e.g. {"anon": True}\
+    for public buckets or credentials, applied over the default read-ahead options.\
+    Defaults to None.
 
     Returns:
 
@@ -188,13 +373,11 @@ def file_integrity_checking(
         'file_integrity': True
     }
     """
-    return_dict = {}
-
     # get file name from path
-    file_path = os.path.abspath(file_path)
-    _, file_name = os.path.split(file_path)
-    _, file_extension = os.path.splitext(file_path)
-    file_extension = file_extension.lower()
+    if not os.path.isabs(file_path) and _storage_options(file_path) is None:
+        file_path = os.path.abspath(file_path)
+    file_name_parts = _file_name_parts(file_path)
+    file_extension = file_name_parts.extension
 
     if file_extension not in [".raw", ".nc", ".zarr"]:
         raise Exception("File type not supported for " + str(file_path))
@@ -206,37 +389,32 @@ def file_integrity_checking(
     campaign_id = None
 
     if ".raw" == file_extension:
-        metadata = parse_metadata(file_path)
+        metadata = _read_raw_metadata(file_path, storage_options)
         if metadata is not None:
-            campaign_id = metadata.get("survey_name", None)
-            date = metadata.get("timestamp", None)
-            sonar_model = detect_sonar_model(file_path, metadata=metadata)
+            campaign_id = metadata["campaign_id"]
+            date = metadata["date"]
+            sonar_model = metadata["sonar_model"]
 
     if not metadata:
-        campaign_id = file_name.split("-")[0]
-
-        try:
-            pattern_date = r"D(\d{4})(\d{2})(\d{2})"
-            pattern_time = r"T(\d{2})(\d{2})(\d{2})"
-
-            matches_date = re.findall(pattern_date, file_name)[0]
-            matches_time = re.findall(pattern_time, file_name)[0]
-
-            year, month, day = matches_date
-            hour, minute, second = matches_time
-
-            datetime_string = f"D{year}{month}{day}-T{hour}{minute}{second}"
-            date = datetime.strptime(datetime_string, "D%Y%m%d-T%H%M%S")
-        except Exception as e:
-            e += "!"
+        campaign_id = file_name_parts.campaign_id
+        date = file_name_parts.date
+        if date is None:
             file_integrity = False
-            date = None
 
-    return_dict["file_path"] = file_path
-    return_dict["campaign_id"] = campaign_id
-    return_dict["date"] = date
-    return_dict["file_integrity"] = file_integrity
-    return_dict["sonar_model"] = sonar_model
+    # the campaign IDs and sonar models repeat for all the files of a campaign,
+    # so a single string object is shared by all their dictionaries
+    if campaign_id is not None:
+        campaign_id = sys.intern(campaign_id)
+    if sonar_model is not None:
+        sonar_model = sys.intern(sonar_model)
+
+    return_dict: FileInfo = {
+        "file_path": file_path,
+        "campaign_id": campaign_id,
+        "date": date,
+        "file_integrity": file_integrity,
+        "sonar_model": sonar_model,
+    }
 
     if ".raw" == file_extension:
         return_dict["use_swap"] = use_swap
@@ -244,9 +422,53 @@ def file_integrity_checking(
     return return_dict
 
 
+def file_integrity_checking_batch(
+    file_paths: List[str],
+    use_swap: bool = False,
+    max_workers: Optional[int] = None,
+    storage_options: Optional[Dict] = None,
+) -> List[FileInfo]:
+    """
+    Checks the integrity of multiple echo sounder files in parallel.
+
+    Each file is handed to `file_integrity_checking` in a separate worker
+    process, so the header parsing of large batches of files
+    scales with the number of available cores.
+
+    Parameters:
+
+    - file_paths (list of str): Absolute paths to the echo sounder files.
+    - use_swap (bool, optional): Passed through to `file_integrity_checking`.\
+    Defaults to False.
+    - max_workers (int, optional): Maximum number of worker processes.\
+    Defaults to the number of processors on the machine.
+    - storage_options (dict, optional): Passed through to `file_integrity_checking`.\
+    Defaults to None.
+
+    Returns:
+
+    - list of dict: The `file_integrity_checking` result for each file,\
+    in the same order as `file_paths`.
+
+    Example:
+    file_integrity_checking_batch(["/path/to/file1.raw", "/path/to/file2.raw"])
+    """
+    if not file_paths:
+        return []
+
+    check_file = functools.partial(
+        file_integrity_checking, use_swap=use_swap, storage_options=storage_options
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(check_file, file_paths, chunksize=8))
+
+
 def read_raw_files(
-    file_dicts: List[Dict[str, Union[str, datetime, bool]]]
-) -> List[ep.echodata.EchoData]:
+    file_dicts: List[FileInfo],
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    storage_options: Optional[Dict] = None,
+) -> List["ep.echodata.EchoData"]:
     """
     Reads multiple raw echo sounder files and returns a list of Datasets.
 
@@ -260,20 +482,95 @@ def read_raw_files(
     - file_dicts (list of dict): List of dictionaries, \
     each containing file information \
     as provided by the file_integrity_checking function.
+    - executor (Executor, optional): If provided, the files are opened\
+    concurrently by submitting one task per file to this executor.\
+    Defaults to None (files are opened one after the other).
+    - max_workers (int, optional): If provided and no executor is given,\
+    the files are opened in a thread pool with this many workers.\
+    Defaults to None.
+    - storage_options (dict, optional): fsspec options for remote URLs, e.g. {"anon": True}\
+    for public buckets or credentials, applied over the default read-ahead options.\
+    Defaults to None.
 
     Returns:
 
     - list: List of EchoData datasets corresponding to each raw file.
 
     """
+    if executor is None and max_workers is not None:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return read_raw_files(file_dicts, executor=pool, storage_options=storage_options)
+
+    read_file = functools.partial(_read_file_dict, storage_options=storage_options)
+    if executor is not None:
+        futures = [executor.submit(read_file, f_i) for f_i in file_dicts]
+        return [future.result() for future in futures]
+
     ret_list = []
     for f_i in file_dicts:
-        opened_file = _read_file(file_path=f_i["file_path"])
+        opened_file = read_file(f_i)
         ret_list.append(opened_file)
     return ret_list
 
 
-def read_processed_files(file_paths: List[str]) -> List[ep.echodata.EchoData]:
+def iter_raw_files(file_dicts: List[FileInfo], storage_options: Optional[Dict] = None):
+    """
+    Reads multiple raw echo sounder files and yields their datasets one by one.
+
+    While the caller works on one dataset, the next file is already being
+    read in a background thread. At most three datasets are held in memory:
+    the one held by the caller, one read ahead and waiting, and one being read.
+
+    Parameters:
+
+    - file_dicts (list of dict): List of dictionaries, \
+    each containing file information \
+    as provided by the file_integrity_checking function.
+    - storage_options (dict, optional): fsspec options for remote URLs, e.g. {"anon": True}\
+    for public buckets or credentials, applied over the default read-ahead options.\
+    Defaults to None.
+
+    Yields:
+
+    - EchoData: The dataset of each raw file, in the order of file_dicts.
+
+    """
+    read_file = functools.partial(_read_file_dict, storage_options=storage_options)
+    with closing(_prefetch(read_file, file_dicts, maxsize=1)) as opened_files:
+        yield from opened_files
+
+
+def read_raw_files_lazy(file_dicts: List[FileInfo]) -> list:
+    """
+    Returns one dask.delayed task per raw file instead of opening the files.
+
+    Nothing is read until the tasks are computed, e.g. with dask.compute
+    or by a dask distributed client, so that opening the files can be
+    scheduled together with the processing that follows.
+
+    Parameters:
+
+    - file_dicts (list of dict): List of dictionaries, \
+    each containing file information \
+    as provided by the file_integrity_checking function.
+
+    Returns:
+
+    - list: List of dask.delayed objects, each computing to the EchoData of one raw file.
+
+    """
+    import dask
+
+    return [dask.delayed(_read_file_dict)(f_i) for f_i in file_dicts]
+
+
+def read_processed_files(
+    file_paths: List[str],
+    chunks: Optional[Dict[str, int]] = None,
+    max_workers: Optional[int] = None,
+    cache: bool = False,
+    storage_options: Optional[Dict] = None,
+) -> List["ep.echodata.EchoData"]:
     """
     Reads multiple processed echo sounder files and returns a list of Datasets.
 
@@ -284,6 +581,19 @@ def read_processed_files(file_paths: List[str]) -> List[ep.echodata.EchoData]:
 
     - file_paths (list of str): List of file paths\
     to processed echo sounder files.
+    - chunks (dict, optional): Dask chunk sizes used when opening the files,\
+    e.g. {"ping_time": 1000}. The data variables are read lazily either way.\
+    Defaults to None (echopype defaults).
+    - max_workers (int, optional): If provided, the files are opened in a thread pool\
+    with this many workers, which hides the latency of remote or network storage.\
+    Defaults to None (files are opened one after the other).
+    - cache (bool, optional): If True, local files that were already opened with cache=True\
+    in this process and have not changed since are returned from a cache,\
+    which clear_read_cache empties. The cached EchoData objects are shared between\
+    the callers and keep their files open, so they must not be modified. Defaults to False.
+    - storage_options (dict, optional): fsspec options for remote URLs, e.g. {"anon": True}\
+    for public buckets or credentials, applied over the default read-ahead options.\
+    Defaults to None.
 
     Returns:
 
@@ -291,14 +601,45 @@ def read_processed_files(file_paths: List[str]) -> List[ep.echodata.EchoData]:
     corresponding to each processed file.
 
     """
+    read_file = functools.partial(
+        _read_cached_file if cache else _read_file, chunks=chunks, storage_options=storage_options
+    )
+    if max_workers is not None:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(read_file, file_paths))
+
     ret_list = []
     for file_path in file_paths:
-        opened_file = _read_file(file_path)
+        opened_file = read_file(file_path)
         ret_list.append(opened_file)
     return ret_list
 
 
-def _read_file(file_path: str, sonar_model: str = None) -> ep.echodata.EchoData:
+def _read_cached_file(
+    file_path: str,
+    chunks: Optional[Dict[str, int]] = None,
+    storage_options: Optional[Dict] = None,
+) -> "ep.echodata.EchoData":
+    """
+    Opens a file like _read_file, through the cache of converted files
+    for local netCDF and zarr files.
+    """
+    extension = _file_name_parts(file_path).extension
+    if extension not in (".nc", ".zarr") or _storage_options(file_path) is not None:
+        return _read_file(file_path, chunks=chunks, storage_options=storage_options)
+
+    mtime_ns = os.stat(file_path).st_mtime_ns
+    chunks_key = None if chunks is None else tuple(sorted(chunks.items()))
+    return _open_converted_cached(file_path, mtime_ns, chunks_key)
+
+
+def _read_file(
+    file_path: str,
+    sonar_model: str = None,
+    chunks: Optional[Dict[str, int]] = None,
+    use_swap: bool = False,
+    storage_options: Optional[Dict] = None,
+) -> "ep.echodata.EchoData":
     """
     Reads an echo sounder file and
     returns the corresponding Dataset.
@@ -310,13 +651,19 @@ def _read_file(file_path: str, sonar_model: str = None) -> ep.echodata.EchoData:
 
     Parameters:
 
-    - file_path (str): Absolute path to the echo sounder file.
-    - sonar_model (str, optional): Type of sonar model. Defaults to "EK80".\
-      Relevant only for raw files.
+    - file_path (str): Absolute path to the echo sounder file, or a remote URL\
+      (s3://, gs://, http(s)://) opened directly with fsspec, without a local copy.
+    - sonar_model (str, optional): Type of sonar model, as found by file_integrity_checking.\
+      Detected from the file header if not provided. Relevant only for raw files.
     - use_swap (bool, optional): Parameter specific to the echopype library `open_raw` function. Defaults to False\
       If True, variables with a large memory footprint will be written to a temporary zarr store at \
       ``~/.echopype/temp_output/parsed2zarr_temp_files``\
       Relevant only for raw files.
+    - chunks (dict, optional): Dask chunk sizes used when opening\
+      netCDF or zarr files, e.g. {"ping_time": 1000}. Defaults to None (echopype defaults).
+    - storage_options (dict, optional): fsspec options for remote URLs, e.g. {"anon": True}\
+      for public buckets or credentials, applied over the default read-ahead options.\
+      Defaults to None.
 
     Returns:
 
@@ -327,23 +674,76 @@ def _read_file(file_path: str, sonar_model: str = None) -> ep.echodata.EchoData:
     - Exception: If the file type is not supported by echopype.
 
     """
-    file_name = os.path.split(file_path)[-1]
-    if ".raw" in file_name:
-        if sonar_model is None:
-            sonar_model = detect_sonar_model(file_path)
-
-        ed = ep.open_raw(file_path, sonar_model=sonar_model)  # type: ignore
-    elif ".nc" in file_name or ".zarr" in file_name:
-        ed = ep.open_converted(file_path)  # create an EchoData object
-    else:
+    reader = _READERS.get(_file_name_parts(file_path).extension)
+    if reader is None:
         raise Exception("File not supported by echopype.")
-    return ed
+    return reader(
+        file_path,
+        sonar_model=sonar_model,
+        chunks=chunks,
+        use_swap=use_swap,
+        storage_options=storage_options,
+    )
+
+
+def _open_raw_file(
+    file_path: str,
+    sonar_model: Optional[str],
+    chunks: Optional[Dict[str, int]],
+    use_swap: bool,
+    storage_options: Optional[Dict] = None,
+) -> "ep.echodata.EchoData":
+    """
+    Opens a raw file with echopype, detecting the sonar model if it is not given.
+    The chunks are not used for raw files.
+    """
+    import echopype as ep
+
+    if sonar_model is None:
+        sonar_model = detect_sonar_model(file_path, storage_options=storage_options)
+
+    return ep.open_raw(
+        file_path,
+        sonar_model=sonar_model,  # type: ignore
+        storage_options=_storage_options(file_path, storage_options),
+        use_swap=use_swap,
+    )
+
+
+def _open_converted_file(
+    file_path: str,
+    sonar_model: Optional[str],
+    chunks: Optional[Dict[str, int]],
+    use_swap: bool,
+    storage_options: Optional[Dict] = None,
+) -> "ep.echodata.EchoData":
+    """
+    Opens a netCDF or zarr file with echopype.
+    The sonar model and use_swap are not used for converted files.
+    """
+    import echopype as ep
+
+    # create an EchoData object
+    return ep.open_converted(
+        file_path, storage_options=_storage_options(file_path, storage_options), chunks=chunks
+    )
+
+
+# function used by _read_file to open each supported file extension
+_READERS = {
+    ".raw": _open_raw_file,
+    ".nc": _open_converted_file,
+    ".zarr": _open_converted_file,
+}
 
 
 def convert_raw_files(
-    file_dicts: List[Dict[str, Union[str, datetime, bool]]],
+    file_dicts: List[FileInfo],
     save_path: str = "",
-    save_file_type: str = "nc",
+    save_file_type: str = "zarr",
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    write_workers: int = 1,
 ) -> List[str]:
     """
     Converts multiple raw echo sounder files to the
@@ -362,29 +762,324 @@ def convert_raw_files(
     the converted files will be saved.
     - save_file_type (str): Desired file type\
     for saving the converted files.\
-    Options are 'nc' or 'zarr'.
+    Options are 'nc' or 'zarr'. Defaults to 'zarr',\
+    which is faster to write and read back in chunks than netCDF.
+    - executor (Executor, optional): If provided, each file is read and\
+    written by a separate task submitted to this executor.\
+    Defaults to None, in which case the next file is read in a background\
+    thread while the current one is being written.
+    - max_workers (int, optional): If provided and no executor is given,\
+    the files are converted in a process pool with this many workers.\
+    Defaults to None.
+    - write_workers (int, optional): Number of files written at the same time\
+    by a thread pool when neither executor nor max_workers is given.\
+    Useful for object stores or several disks, each pending write holds one dataset\
+    in memory. Defaults to 1.
 
     Returns:
 
     - list: List of paths to the saved converted files.
 
     """
+    if executor is None and max_workers is not None:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return convert_raw_files(file_dicts, save_path, save_file_type, executor=pool)
+
+    if executor is not None:
+        futures = [
+            executor.submit(_convert_file, f_i, save_path, save_file_type) for f_i in file_dicts
+        ]
+        return [future.result() for future in futures]
+
+    if write_workers > 1:
+        return _convert_with_write_pool(file_dicts, save_path, save_file_type, write_workers)
+
     ret_list = []
-    for f_i in file_dicts:
-        opened_file = _read_file(file_path=f_i["file_path"])
-        _write_file(opened_file, save_path, save_file_type)
-        file_name = os.path.split(f_i["file_path"])[-1]
-        file_type = save_file_type
-        new_file_name = file_name.replace("raw", file_type)
-        ret_list.append(os.path.join(save_path, new_file_name))
+    for converted in convert_raw_files_iter(file_dicts, save_path, save_file_type):
+        ret_list.append(converted[0])
+        # release the dataset before the next one is taken from the prefetch queue
+        del converted
+    return ret_list
+
+
+def _convert_with_write_pool(
+    file_dicts: List[FileInfo],
+    save_path: str,
+    save_file_type: str,
+    write_workers: int,
+) -> List[str]:
+    """
+    Reads the raw files one after the other and hands each opened dataset to
+    a thread pool for writing, keeping at most `write_workers` writes pending.
+    """
+    ret_list = []
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=write_workers) as pool:
+        with closing(_prefetch(_read_file_for_conversion, file_dicts)) as opened_files:
+            for f_i, opened_file in opened_files:
+                if len(pending) >= write_workers:
+                    pending.popleft().result()
+                pending.append(pool.submit(_write_file, opened_file, save_path, save_file_type))
+                # only the pending write keeps the dataset alive from here on
+                del opened_file
+                ret_list.append(_converted_file_path(f_i["file_path"], save_path, save_file_type))
+        while pending:
+            pending.popleft().result()
     return ret_list
 
 
+def convert_raw_files_iter(
+    file_dicts: Iterable[FileInfo],
+    save_path: str = "",
+    save_file_type: str = "zarr",
+):
+    """
+    Converts multiple raw echo sounder files like convert_raw_files,
+    but yields each converted file together with its opened dataset.
+
+    Callers that go on to work with the converted data can use the yielded
+    EchoData objects directly instead of opening the saved files again.
+    The next file is read in a background thread while the current one is written.
+
+    Parameters:
+
+    - file_dicts (list of dict): List of dictionaries,\
+    each containing file information.
+    - save_path (str): Directory path where\
+    the converted files will be saved.
+    - save_file_type (str): Desired file type\
+    for saving the converted files.\
+    Options are 'nc' or 'zarr'. Defaults to 'zarr',\
+    which is faster to write and read back in chunks than netCDF.
+
+    Yields:
+
+    - tuple: The path to the saved converted file and its EchoData object.
+
+    """
+    with closing(_prefetch(_read_file_for_conversion, file_dicts)) as opened_files:
+        for f_i, opened_file in opened_files:
+            _write_file(opened_file, save_path, save_file_type)
+            yield _converted_file_path(f_i["file_path"], save_path, save_file_type), opened_file
+            # do not hold on to the dataset while waiting for the next file
+            del opened_file
+
+
+def process_raw_files_iter(
+    file_paths: Iterable[str],
+    save_path: str = "",
+    save_file_type: str = "zarr",
+):
+    """
+    Checks and converts raw echo sounder files one at a time and yields
+    the file information of each converted file.
+
+    Unlike calling file_integrity_checking, convert_raw_files and file_integrity_checking
+    again on the results, no stage builds a list of all files, so any iterable of paths
+    (e.g. a generator over a very large survey) can be streamed through with bounded memory.
+    Files that fail the integrity check are skipped.
+
+    Parameters:
+
+    - file_paths (iterable of str): Paths to the raw files, e.g. as returned by file_finder.
+    - save_path (str): Directory path where\
+    the converted files will be saved.
+    - save_file_type (str): Desired file type\
+    for saving the converted files.\
+    Options are 'nc' or 'zarr'. Defaults to 'zarr',\
+    which is faster to write and read back in chunks than netCDF.
+
+    Yields:
+
+    - dict: The file information of each converted file, as returned by metadata_from_ed.
+
+    """
+    checked_files = (file_integrity_checking(file_path) for file_path in file_paths)
+    valid_files = (f_i for f_i in checked_files if f_i["file_integrity"])
+    for converted_path, ed in convert_raw_files_iter(valid_files, save_path, save_file_type):
+        yield metadata_from_ed(converted_path, ed)
+
+
+def metadata_from_ed(file_path: str, ed: "ep.echodata.EchoData") -> FileInfo:
+    """
+    Returns the file information of a converted file without opening it again.
+
+    The campaign ID and date are taken from the file name as in
+    file_integrity_checking, and the sonar model from the already opened dataset.
+
+    Parameters:
+
+    - file_path (str): Path to the converted file, e.g. as yielded by convert_raw_files_iter.
+    - ed (EchoData): The dataset that was saved to file_path.
+
+    Returns:
+
+    - dict: The file information dictionary, as returned by file_integrity_checking.
+
+    """
+    file_info = file_integrity_checking(file_path)
+    if file_info["sonar_model"] is None:
+        file_info["sonar_model"] = ed.sonar_model
+    return file_info
+
+
+def _convert_file(
+    file_dict: FileInfo,
+    save_path: str,
+    save_file_type: str,
+) -> str:
+    """
+    Reads a single raw echo sounder file, writes it to the
+    specified file type and returns the path of the converted file.
+    """
+    _, opened_file = _read_file_for_conversion(file_dict)
+    _write_file(opened_file, save_path, save_file_type)
+    return _converted_file_path(file_dict["file_path"], save_path, save_file_type)
+
+
+@functools.lru_cache(maxsize=64)
+def _open_converted_cached(file_path: str, mtime_ns: int, chunks_key: Optional[tuple]):
+    """
+    Opens a netCDF or zarr file once per path, modification time and chunks,
+    so that reading the same converted file again returns the EchoData already opened.
+    Used by read_processed_files(..., cache=True) only.
+    The data variables are lazy, so the cached objects hold little memory.
+    """
+    import echopype as ep
+
+    chunks = None if chunks_key is None else dict(chunks_key)
+    return ep.open_converted(file_path, chunks=chunks)
+
+
+def clear_read_cache():
+    """
+    Forgets the converted files opened so far by read_processed_files(..., cache=True),
+    e.g. between the stages of a pipeline.
+    """
+    _open_converted_cached.cache_clear()
+
+
+def _converted_file_path(file_path: str, save_path: str, save_file_type: str) -> str:
+    """
+    Returns the path of the file a raw file is converted to.
+    echopype names it after the raw file, with the extension of the new file type.
+    """
+    return os.path.join(save_path, _file_name_parts(file_path).stem + "." + save_file_type)
+
+
+def _read_file_dict(
+    file_dict: FileInfo,
+    chunks: Optional[Dict[str, int]] = None,
+    storage_options: Optional[Dict] = None,
+) -> "ep.echodata.EchoData":
+    """
+    Opens the echo sounder file described by a file information dictionary,
+    using the sonar model and use_swap option already stored in it.
+    """
+    return _read_file(
+        file_dict["file_path"],
+        sonar_model=file_dict.get("sonar_model"),
+        chunks=chunks,
+        use_swap=file_dict.get("use_swap", False),
+        storage_options=storage_options,
+    )
+
+
+def _read_file_dict_chunked(
+    file_dict: FileInfo, chunks: Optional[Dict[str, int]] = None
+) -> "ep.echodata.EchoData":
+    """
+    Opens a file like _read_file_dict, with all beam group data as dask arrays.
+    """
+    if _file_name_parts(file_dict["file_path"]).extension != ".raw":
+        return _read_file_dict(file_dict, chunks={} if chunks is None else chunks)
+
+    ed = _read_file_dict(file_dict)
+    _chunk_beam_groups(ed, RAW_CONCAT_CHUNKS if chunks is None else chunks, save_file_type=None)
+    return ed
+
+
+def _read_file_for_conversion(file_dict: FileInfo) -> tuple:
+    """
+    Opens a raw file like _read_file_dict and returns it together with its file information,
+    so that consumers of _prefetch do not need to iterate over the files a second time.
+    open_raw has parsed the whole file by then, so its pages are dropped from the page cache.
+    """
+    opened_file = _read_file_dict(file_dict)
+    _drop_from_page_cache(file_dict["file_path"])
+    return file_dict, opened_file
+
+
+def _drop_from_page_cache(file_path: str):
+    """
+    Advises the kernel that a file that was read once will not be needed again,
+    so that converting a large survey does not evict more useful pages from the cache.
+    Does nothing on platforms without posix_fadvise.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _prefetch(func, items, maxsize: int = 2):
+    """
+    Lazily yields func(item) for each item, while a background thread
+    computes up to `maxsize` of the following results ahead of the consumer.
+
+    Exceptions raised by func are re-raised in the consuming thread.
+    Closing the generator stops the background thread.
+    """
+    results = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                if stop.is_set():
+                    break
+                results.put((func(item), None))
+        except Exception as e:
+            results.put((None, e))
+        finally:
+            results.put(None)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            element = results.get()
+            if element is None:
+                break
+            result, error = element
+            if error is not None:
+                raise error
+            yield result
+    finally:
+        stop.set()
+        # unblock the producer if it is waiting on a full queue
+        while producer.is_alive():
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
 def _write_file(
-    ed: ep.echodata.EchoData,
+    ed: "ep.echodata.EchoData",
     save_path: str,
-    save_file_type: str = "nc",
+    save_file_type: str = "zarr",
     overwrite: bool = False,  # noqa: E501
+    chunks: Optional[Dict[str, int]] = None,
+    compress: bool = True,
 ) -> str:
     """
     Writes an echo sounder dataset to a
@@ -393,16 +1088,27 @@ def _write_file(
     This function takes an EchoData dataset,
     converts it to the specified file type
     (netCDF or zarr), and saves the file to the provided path.
+    Variables are compressed by default, and the beam groups can be
+    rechunked (typically along ping_time) before writing so that
+    large files are not stored as a single chunk per variable.
 
     Parameters:
 
     - ed (EchoData): echo sounder dataset to be saved.
     - save_path (str): Directory path where the dataset will be saved.
     - save_file_type (str, optional): Desired file type\
-    for saving the dataset. Defaults to 'nc'.\
+    for saving the dataset. Defaults to 'zarr'.\
       Options are 'nc' or 'zarr'.
     - overwrite (bool, optional): If True, overwrites\
     the file if it already exists. Defaults to False.
+    - chunks (dict, optional): Chunk size for each dimension,\
+    e.g. {"ping_time": 1000, "range_sample": -1}, applied to the beam groups\
+    and stored as their chunking. With compression, echopype keeps zarr chunks\
+    close to 100MB and adjusts smaller ones. Defaults to None: echopype's default chunking\
+    for zarr, and whole pings in chunks of about NETCDF_CHUNK_BYTES for netCDF.
+    - compress (bool, optional): If True, compresses the variables with echopype's\
+    default settings (zlib for netCDF, Blosc zstd with bit shuffle for zarr).\
+    Defaults to True.
 
     Returns:
 
@@ -413,63 +1119,111 @@ def _write_file(
     - Exception: If the specified file type is not supported by echopype.
 
     """
+    if save_file_type not in ["nc", "zarr"]:
+        raise Exception("File type not supported echopype.")
+
+    if chunks is not None:
+        _chunk_beam_groups(ed, chunks, save_file_type)
+    elif save_file_type == "nc":
+        _set_netcdf_chunksizes(ed)
+
     if save_file_type == "nc":
-        ed.to_netcdf(save_path=save_path, overwrite=overwrite)
-    elif save_file_type == "zarr":
-        ed.to_zarr(save_path=save_path, overwrite=overwrite)
+        ed.to_netcdf(save_path=save_path, overwrite=overwrite, compress=compress)
     else:
-        raise Exception("File type not supported echopype.")
+        ed.to_zarr(save_path=save_path, overwrite=overwrite, compress=compress)
     return save_path
 
 
-def _is_similar(
-    file_dict1: Dict[str, Union[str, datetime, bool]],
-    file_dict2: Dict[str, Union[str, datetime, bool]],
-) -> bool:
+def _pick_chunks(var, chunk_bytes: int = NETCDF_CHUNK_BYTES) -> tuple:
     """
-    Determines if two file information dictionaries
-    are similar based on specific criteria.
-
-    This function checks if two file dictionaries
-    have the same campaign ID, sonar model,
-    file integrity, and if their date difference
-    is within a specified time range.
-
-    Parameters:
-
-    - file_dict1 (dict): First file information dictionary.
-    - file_dict2 (dict): Second file information dictionary.
-
-    Returns:
+    Returns chunk sizes for a variable along ping_time such that each chunk
+    holds whole pings (all the other dimensions in full) and about chunk_bytes.
+    """
+    ping_bytes = var.dtype.itemsize * int(
+        np.prod([n for dim, n in var.sizes.items() if dim != "ping_time"])
+    )
+    n_pings = max(1, min(var.sizes["ping_time"], chunk_bytes // max(1, ping_bytes)))
+    return tuple(n_pings if dim == "ping_time" else n for dim, n in var.sizes.items())
 
-    - bool: True if the file dictionaries are similar\
-    based on the criteria, False otherwise.
 
+def _set_netcdf_chunksizes(ed: "ep.echodata.EchoData"):
     """
-    if file_dict1["campaign_id"] != file_dict2["campaign_id"]:
-        return False
-    if file_dict1["sonar_model"] != file_dict2["sonar_model"]:
-        return False
-    if file_dict1["file_integrity"] != file_dict2["file_integrity"]:
-        return False
-    date_diff = file_dict1["date"] - file_dict2["date"]
-    if date_diff > timedelta(minutes=TIME_BETWEEN_FILES):
-        return False
-    return True
+    Sets the netCDF chunk sizes picked by _pick_chunks as the encoding of the
+    numeric beam group variables along ping_time that are not chunked yet,
+    rather than leaving the chunk shape to the netCDF library.
+    """
+    for group in ed.group_paths:
+        if not group.startswith("Sonar/Beam_group"):
+            continue
+        ds = ed[group]
+        for var in ds.data_vars.values():
+            if (
+                "ping_time" in var.dims
+                and var.size > 0
+                and np.issubdtype(var.dtype, np.number)
+                and "chunksizes" not in var.encoding
+            ):
+                var.encoding["chunksizes"] = _pick_chunks(var)
+        ed[group] = ds
+
+
+def _chunk_beam_groups(
+    ed: "ep.echodata.EchoData", chunks: Dict[str, int], save_file_type: Optional[str] = "zarr"
+):
+    """
+    Rechunks the beam groups of an EchoData object in place,
+    along the dimensions of `chunks` that exist in each group.
+
+    echopype derives the stored chunks from the variable encodings rather than
+    from the dask chunks, so the new chunk sizes are also set as the encoding
+    of the rechunked data variables ("chunksizes" for netCDF, "chunks" for zarr).
+    For zarr, echopype may still replace chunks far below its ~100MB target.
+    With save_file_type None only the dask chunks are changed.
+    """
+    encoding_key = "chunksizes" if save_file_type == "nc" else "chunks"
+    for group in ed.group_paths:
+        if not group.startswith("Sonar/Beam_group"):
+            continue
+        ds = ed[group]
+        group_chunks = {dim: size for dim, size in chunks.items() if dim in ds.dims}
+        if not group_chunks:
+            continue
+        ds = ds.chunk(group_chunks)
+        if save_file_type is not None:
+            for var in ds.data_vars.values():
+                if var.chunks is not None and any(dim in group_chunks for dim in var.dims):
+                    var.encoding[encoding_key] = tuple(max(sizes) for sizes in var.chunks)
+        ed[group] = ds
+
+
+def _to_datetime64(date: Optional[datetime]) -> np.datetime64:
+    """
+    Converts a (possibly timezone aware) datetime to a naive UTC numpy datetime64.
+    Missing dates are converted to NaT.
+    """
+    if date is None:
+        return np.datetime64("NaT")
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(date, "us")
 
 
-def split_files(
-    file_dicts: List[Dict[str, Union[str, datetime, bool]]]
-) -> List[List[Dict[str, Union[str, datetime, bool]]]]:
+def split_files(file_dicts: List[FileInfo]) -> List[List[FileInfo]]:
     """
     Splits a list of file information dictionaries
     into sublists based on their similarity.
 
     This function processes a list of file information
     dictionaries and groups them into
-    sublists where each sublist contains files
-    that are similar to each other based on
-    specific criteria.
+    sublists where each sublist contains consecutive files
+    with the same campaign ID, sonar model and file integrity,
+    and whose dates are at most TIME_BETWEEN_FILES minutes apart.
+    The files are ordered by campaign ID, sonar model, file integrity and date first,
+    so the result does not depend on the order of the input list, and files of
+    different campaigns recorded at the same time are not interleaved.
+    Within each of these, files without a date keep their relative order at the end.
+    The group boundaries are computed with vectorized numpy comparisons
+    over the whole list.
 
     Parameters:
 
@@ -480,62 +1234,252 @@ def split_files(
     - list of lists: List containing sublists of file dictionaries\
     grouped by their similarity.
 
+    Raises:
+
+    - ValueError: If the list of file dictionaries is empty.
+
     """
-    list_of_lists = []
+    if not file_dicts:
+        raise ValueError("No files to split.")
+
+    dates = np.array([_to_datetime64(f_i["date"]) for f_i in file_dicts], dtype="datetime64[us]")
+    date_keys = dates.astype(np.int64).tolist()
+    missing_dates = np.isnat(dates).tolist()
+
+    def sort_key(i):
+        f_i = file_dicts[i]
+        # None sorts after any campaign ID or sonar model, and missing dates after any date
+        return (
+            f_i["campaign_id"] is None,
+            f_i["campaign_id"] or "",
+            f_i["sonar_model"] is None,
+            f_i["sonar_model"] or "",
+            bool(f_i["file_integrity"]),
+            missing_dates[i],
+            date_keys[i],
+        )
 
-    temp_list = []
-    prev_elem = file_dicts[0]
-    for elem in file_dicts:
-        if _is_similar(elem, prev_elem):
-            temp_list.append(elem)
-        else:
-            list_of_lists.append(temp_list)
-            temp_list = [elem]
-        prev_elem = elem
-    list_of_lists.append(temp_list)
-    return list_of_lists
+    order = sorted(range(len(file_dicts)), key=sort_key)
+    dates = dates[order]
+    file_dicts = [file_dicts[i] for i in order]
+
+    campaign_ids = np.array([f_i["campaign_id"] for f_i in file_dicts])
+    sonar_models = np.array([f_i["sonar_model"] for f_i in file_dicts])
+    file_integrities = np.array([f_i["file_integrity"] for f_i in file_dicts], dtype=bool)
+
+    is_boundary = (
+        (campaign_ids[1:] != campaign_ids[:-1])
+        | (sonar_models[1:] != sonar_models[:-1])
+        | (file_integrities[1:] != file_integrities[:-1])
+        | (np.diff(dates) > np.timedelta64(TIME_BETWEEN_FILES, "m"))
+    )
+    boundaries = [0, *(np.flatnonzero(is_boundary) + 1).tolist(), len(file_dicts)]
+
+    return [file_dicts[start:end] for start, end in zip(boundaries[:-1], boundaries[1:])]
 
 
 def concatenate_files(
-    file_dicts: List[Dict[str, Union[str, datetime, bool]]]
-) -> ep.echodata.EchoData:
-    list_of_datasets = []
-    for file_info in file_dicts:
-        list_of_datasets.append(_read_file(file_info["file_path"]))
+    file_dicts: List[FileInfo],
+    chunks: Optional[Dict[str, int]] = None,
+    max_workers: int = 4,
+) -> "ep.echodata.EchoData":
+    """
+    Opens multiple echo sounder files and combines them into a single EchoData object.
+
+    The files are opened concurrently in a thread pool and
+    combined in the order of the given list.
+    netCDF and zarr files are opened as dask arrays, so that combining them
+    stays lazy and the data is only read when the result is computed or saved.
+    The beam groups of raw files are wrapped in dask arrays as well,
+    so that combining them does not copy all of their data at once.
+
+    Parameters:
+
+    - file_dicts (list of dict): List of file information dictionaries,\
+    usually one of the groups returned by split_files.
+    - chunks (dict, optional): Dask chunk sizes used when opening netCDF or zarr files,\
+    and for the beam groups of raw files.\
+    Defaults to None (the chunks of the stored files, RAW_CONCAT_CHUNKS for raw files).
+    - max_workers (int, optional): Maximum number of files opened at the same time.\
+    Defaults to 4.
+
+    Returns:
+
+    - EchoData: The combined dataset.
+
+    """
+    import echopype as ep
+
+    read_file = functools.partial(_read_file_dict_chunked, chunks=chunks)
+    max_workers = max(1, min(len(file_dicts), max_workers))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list_of_datasets = list(executor.map(read_file, file_dicts))
     combined_dataset = ep.combine_echodata(list_of_datasets)
     return combined_dataset
 
 
-def parse_metadata(file_path):
+@_cache_on_disk
+def _read_raw_metadata(
+    file_path: str, storage_options: Optional[Dict] = None
+) -> Optional[Dict[str, Union[str, datetime]]]:
+    """
+    Extracts the campaign ID, start date and sonar model
+    from the configuration datagram of a raw file.
+    Returns None if the configuration datagram cannot be read.
+    """
+    metadata = parse_metadata(file_path, storage_options)
+    if not metadata:
+        return None
+
+    return {
+        "campaign_id": metadata.get("survey_name", None),
+        "date": metadata.get("timestamp", None),
+        "sonar_model": detect_sonar_model(file_path, metadata=metadata),
+    }
+
+
+def _parse_con0(dgram: bytes, timestamp: datetime) -> Optional[Dict]:
+    """
+    Decodes the survey and sounder names of an EK60 configuration datagram.
+    """
+    if len(dgram) < _CON0_HEADER.size:
+        return None
+    header_values = _CON0_HEADER.unpack_from(dgram, 0)
+    survey_name, transect_name, sounder_name, version = (
+        value.decode("latin_1").strip("\x00") for value in header_values[3:7]
+    )
+    return {
+        "type": "CON0",
+        "timestamp": timestamp,
+        "survey_name": survey_name,
+        "transect_name": transect_name,
+        "sounder_name": sounder_name,
+        "version": version,
+        "transceiver_count": header_values[8],
+    }
+
+
+def _parse_xml0(dgram: bytes, timestamp: datetime) -> Optional[Dict]:
+    """
+    Decodes the XML string of an EK80 configuration datagram.
+    """
+    xml_string = str(dgram[12:].strip(b"\x00"), "ascii", errors="replace")
+    return {"type": "XML0", "timestamp": timestamp, "xml": xml_string}
+
+
+# parsers of the configuration datagrams that raw files start with, by datagram type
+_CONFIG_DATAGRAM_PARSERS = {
+    b"CON0": _parse_con0,
+    b"XML0": _parse_xml0,
+}
+
+
+def _parse_config_datagram(buffer: bytes) -> Optional[Dict]:
+    """
+    Parses the configuration datagram (CON0 for EK60, XML0 for EK80)
+    at the start of a raw file from the given bytes.
+
+    Only the fields needed for the file metadata are decoded:
+    the timestamp, and the survey and sounder names (CON0) or the XML string (XML0).
+    Returns None if the bytes do not start with a complete configuration datagram.
+    """
+    if len(buffer) < 16:
+        return None
+
+    (dgram_size,) = struct.unpack_from("=l", buffer, 0)
+    dgram = buffer[4 : 4 + dgram_size]
+    if dgram_size < 12 or len(dgram) < dgram_size:
+        return None
+
+    parser = _CONFIG_DATAGRAM_PARSERS.get(dgram[:4])
+    if parser is None:
+        return None
+
+    low_date, high_date = struct.unpack_from("=LL", dgram, 4)
+    timestamp = _NT_EPOCH + timedelta(seconds=((high_date << 32) + low_date) * 1.0e-7)
+    return parser(dgram, timestamp)
+
+
+def parse_metadata(file_path, storage_options: Optional[Dict] = None):
+    storage_options = _storage_options(file_path, storage_options)
     try:
-        with RawSimradFile(file_path, "r", storage_options={}) as fid:
-            config_datagram = fid.read(1)
+        if storage_options is None:
+            f = open(file_path, "rb")
+        else:
+            import fsspec
+
+            # the read-ahead block holds the whole datagram, so it takes a single range request
+            f = fsspec.open(file_path, "rb", **storage_options).open()
+        with f:
+            # the datagram starts with its size and type, so exactly that many bytes are read
+            head = f.read(8)
+            config_datagram = None
+            if len(head) == 8:
+                if head[4:] not in _CONFIG_DATAGRAM_PARSERS:
+                    # not a raw file starting with a configuration datagram
+                    return None
+                (dgram_size,) = struct.unpack_from("=l", head, 0)
+                if 0 < dgram_size <= CONFIG_DATAGRAM_MAX_SIZE:
+                    config_datagram = _parse_config_datagram(head + f.read(dgram_size - 4))
+        if config_datagram is not None:
             return config_datagram
+    except (OSError, ImportError):
+        # ImportError when the fsspec backend of a URL scheme is not installed
+        pass
+
+    # fall back to echopype for datagrams that could not be read from the start of the file
+    try:
+        from echopype.convert.utils.ek_raw_io import RawSimradFile
+
+        with RawSimradFile(file_path, "r", storage_options=storage_options or {}) as fid:
+            config_datagram = fid.read(1)
+            # plain dict so the metadata can be sent to worker processes
+            return dict(config_datagram)
     except Exception as e:
         print(f"Error parsing metadata from {file_path}. Error: {e}")
         return None
 
 
-def detect_sonar_model(file_path: str, metadata=None) -> str:
+@functools.lru_cache(maxsize=4096)
+def _detect_sonar_model_cached(file_path: str, mtime_ns: int) -> Optional[str]:
+    # the modification time is part of the cache key so that changed files are read again
+    return _sonar_model_from_metadata(parse_metadata(file_path))
+
+
+def detect_sonar_model(
+    file_path: str, metadata=None, storage_options: Optional[Dict] = None
+) -> Optional[str]:
     if metadata is None:
-        metadata = parse_metadata(file_path)
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return _sonar_model_from_metadata(parse_metadata(file_path, storage_options))
+        return _detect_sonar_model_cached(file_path, mtime_ns)
+
+    return _sonar_model_from_metadata(metadata)
+
 
+def _sonar_model_from_metadata(metadata: Optional[Dict]) -> Optional[str]:
+    """
+    Returns the sonar model described by the configuration datagram of a raw file,
+    as returned by parse_metadata, or None if it is missing or not recognised.
+    """
     if metadata is None:
         return None
 
     if "sounder_name" not in metadata:
-        try:
-            xml_string = metadata.get("xml", None)
-            root = ET.fromstring(xml_string)
-            header = root.find("Header")
-            application_name = header.attrib.get("ApplicationName")
-
-            if application_name == "EK80":
-                return "EK80"
-
-        except ET.ParseError:
+        # only the Header element of the configuration XML is needed,
+        # so it is matched directly instead of parsing the whole document
+        xml_string = metadata.get("xml", None)
+        if isinstance(xml_string, bytes):
+            xml_string = xml_string.decode("utf-8", errors="replace")
+        if not isinstance(xml_string, str):
             return None
 
+        match = _APPLICATION_NAME_RE.search(xml_string)
+        if match is not None and match.group(1) == "EK80":
+            return "EK80"
+
         return None
 
     if metadata["sounder_name"] == "EK60" or metadata["sounder_name"] == "ER60":
@@ -44,7 +44,9 @@ def check_file_integrity(filename, sonar_model: str = None):
         encode_mode = "complex"
     else:
         encode_mode = "power"
-    check["sonar_model"] = sonar_model
+    if sonar_model is not None:
+        # keep the sonar model detected from the file header otherwise
+        check["sonar_model"] = sonar_model
 
     return check, check.get("file_integrity", False), encode_mode
 
@@ -12,8 +12,8 @@ Functions and Classes:
 for Sv computation.
 - `WaveformMode`: Enum specifying the waveform mode ("CW" or "BB").
 - `EncodeMode`: Enum indicating the encoding mode ("complex" or "power").
-- `ComputeSVParams`: Class to validate and structure the parameters passed
-to the Sv computation function.
+- `ComputeSVParams`: Pydantic model of the parameters passed to the Sv computation function,
+kept for API compatibility; `compute_sv` applies the same checks without constructing it.
 - `compute_sv`: Main function to calculate Sv given an EchoData object
 and other optional parameters. This function is based on the `echopype.calibrate.compute_Sv()` function.
 - `compute_sv_with_encode_mode`
@@ -25,12 +25,13 @@ To compute Sv for a given EchoData object, `ed`, simply call:
 """
 
 from enum import Enum
+from collections.abc import Mapping
 from typing import Any, Optional
 
 import echopype as ep
 import xarray as xr
 from echopype.echodata.echodata import EchoData
-from pydantic import BaseModel, ValidationError, field_validator
+from pydantic import BaseModel, field_validator
 
 from oceanstream.report import end_profiling, start_profiling
 
@@ -41,6 +42,9 @@ class SupportedSonarModelsForSv(str, Enum):
     EK80 = "EK80"
 
 
+_SUPPORTED_SV_MODELS = frozenset(m.value for m in SupportedSonarModelsForSv)
+
+
 class WaveformMode(str, Enum):
     CW = "CW"
     BB = "BB"
@@ -65,6 +69,62 @@ class ComputeSVParams(BaseModel):
         return value
 
 
+def _enum_choices(enum) -> str:
+    values = [repr(member.value) for member in enum]
+    return values[0] if len(values) == 1 else ", ".join(values[:-1]) + " or " + values[-1]
+
+
+def _check_compute_params(
+    model_name: str,
+    echodata,
+    env_params=None,
+    cal_params=None,
+    waveform_mode=None,
+    encode_mode=None,
+    **kwargs,
+):
+    """
+    Applies the checks of the `ComputeSVParams` and `ComputeTSParams` models
+    without constructing them, raising a ValueError with the message
+    the pydantic validation error of the model named `model_name` would have.
+    Other keyword arguments are ignored.
+    """
+    errors = []
+    if not isinstance(echodata, EchoData):
+        errors.append(
+            (
+                "echodata",
+                "Value error, Invalid type for echodata. Expected an instance of EchoData.",
+                "value_error",
+                echodata,
+            )
+        )
+    for name, value in (("env_params", env_params), ("cal_params", cal_params)):
+        if value is not None and not isinstance(value, Mapping):
+            errors.append((name, "Input should be a valid dictionary", "dict_type", value))
+    for name, value, enum in (
+        ("waveform_mode", waveform_mode, WaveformMode),
+        ("encode_mode", encode_mode, EncodeMode),
+    ):
+        if value is None:
+            continue
+        try:
+            enum(value)
+        except ValueError:
+            errors.append((name, f"Input should be {_enum_choices(enum)}", "enum", value))
+    if not errors:
+        return
+
+    lines = [f"{len(errors)} validation error{'s' if len(errors) > 1 else ''} for {model_name}"]
+    for name, message, error_type, value in errors:
+        lines.append(name)
+        lines.append(
+            f"  {message} [type={error_type}, input_value={value!r}, "
+            f"input_type={type(value).__name__}]"
+        )
+    raise ValueError("\n".join(lines))
+
+
 def compute_sv(echodata: EchoData, **kwargs) -> xr.Dataset:
     """
     Computes the volume backscattering strength (Sv) from the given echodata.
@@ -84,22 +144,17 @@ def compute_sv(echodata: EchoData, **kwargs) -> xr.Dataset:
     Notes:
     This function:
     - Validates the `echodata`'s sonar model against supported models.
-    - Uses the `ComputeSVParams` pydantic model to validate parameters.
+    - Validates the parameters with the checks of the `ComputeSVParams` model.
     - Checks if the computed Sv is empty.
     - Returns Sv only if it is not empty.
     - Is based on the `echopype.calibrate.compute_Sv()` function.
 
     """
-    # Validate parameters using the pydantic model
-    try:
-        ComputeSVParams(echodata=echodata, **kwargs)
-    except ValidationError as e:
-        raise ValueError(str(e))
+    # Validate parameters, as the ComputeSVParams model does
+    _check_compute_params("ComputeSVParams", echodata, **kwargs)
     # Check if the sonar model is supported
     sonar_model = echodata.sonar_model
-    try:
-        SupportedSonarModelsForSv(sonar_model)
-    except ValueError:
+    if sonar_model not in _SUPPORTED_SV_MODELS:
         raise ValueError(
             f"Sonar model '{sonar_model}'\
                           is not supported for Sv computation.\
@@ -109,7 +164,7 @@ def compute_sv(echodata: EchoData, **kwargs) -> xr.Dataset:
     # Compute Sv
     Sv = ep.calibrate.compute_Sv(echodata, **kwargs)
     # Check if the computed Sv is empty
-    if Sv["Sv"].values.size == 0:
+    if Sv["Sv"].size == 0:
         raise ValueError("Computed Sv is empty!")
     return Sv
 
@@ -14,8 +14,9 @@ Functions and Classes:
 for TS computation.
 - `WaveformMode`: Enum specifying the waveform mode ("CW" or "BB").
 - `EncodeMode`: Enum indicating the encoding mode ("complex" or "power").
-- `ComputeTSParams`: Class to validate and structure the parameters passed
-to the TS computation function.
+- `ComputeTSParams`: Pydantic model of the parameters passed to the TS computation function,
+kept for API compatibility; `compute_target_strength` applies the same checks
+without constructing it.
 - `compute_target_strength`: Main function to calculate TS given an EchoData object
 and other optional parameters. This function is based on the `echopype.calibrate.compute_TS()` function.
 
@@ -31,7 +32,9 @@ from typing import Any, Optional
 import echopype as ep
 import xarray as xr
 from echopype.echodata.echodata import EchoData
-from pydantic import BaseModel, ValidationError, field_validator
+from pydantic import BaseModel, field_validator
+
+from oceanstream.echodata.sv_computation import _check_compute_params
 
 
 class SupportedSonarModelsForTS(str, Enum):
@@ -40,6 +43,9 @@ class SupportedSonarModelsForTS(str, Enum):
     EK80 = "EK80"
 
 
+_SUPPORTED_TS_MODELS = frozenset(m.value for m in SupportedSonarModelsForTS)
+
+
 class WaveformMode(str, Enum):
     CW = "CW"
     BB = "BB"
@@ -79,22 +85,17 @@ def compute_target_strength(echodata: EchoData, **kwargs) -> xr.Dataset:
     Notes:
     This function:
     - Validates the `echodata`'s sonar model against supported models.
-    - Uses the `ComputeTSParams` pydantic model to validate parameters.
+    - Validates the parameters with the checks of the `ComputeTSParams` model.
     - Checks if the computed TS is empty.
     - Returns TS only if it is not empty.
     - Is based on the `echopype.calibrate.compute_TS()` function.
 
     """
-    # Validate parameters using the pydantic model
-    try:
-        ComputeTSParams(echodata=echodata, **kwargs)
-    except ValidationError as e:
-        raise ValueError(str(e))
+    # Validate parameters, as the ComputeTSParams model does
+    _check_compute_params("ComputeTSParams", echodata, **kwargs)
     # Check if the sonar model is supported
     sonar_model = echodata.sonar_model
-    try:
-        SupportedSonarModelsForTS(sonar_model)
-    except ValueError:
+    if sonar_model not in _SUPPORTED_TS_MODELS:
         raise ValueError(
             f"Sonar model '{sonar_model}'\
                           is not supported for TS computation.\
@@ -104,6 +105,6 @@ def compute_target_strength(echodata: EchoData, **kwargs) -> xr.Dataset:
     # Compute TS
     TS = ep.calibrate.compute_TS(echodata, **kwargs)
     # Check if the computed TS is empty
-    if TS["TS"].values.size == 0:
+    if TS["TS"].size == 0:
         raise ValueError("Computed TS is empty!")
     return TS
@@ -26,8 +26,26 @@ def add_metadata_to_mask(mask: xr.Dataset, metadata: Dict) -> xr.Dataset:
     Expected Output:
     A mask with the metadata stored as global attributes
     """
-    for k, v in metadata.items():
-        mask.attrs[k] = v
+    mask.attrs.update(metadata)
+    return mask
+
+
+def as_bool_mask(mask: xr.DataArray) -> xr.DataArray:
+    """
+    Casts an integer 0/1 mask to booleans, which take 1 byte per value;
+    other masks are returned as they are
+
+    Parameters:
+    - mask (xarray.DataArray): mask to be cast
+
+    Returns:
+    - xarray.DataArray: boolean mask
+
+    Example:
+        >>> as_bool_mask(mask)
+    """
+    if mask.dtype.kind in "iu":
+        return mask.astype(bool, copy=False)
     return mask
 
 
@@ -76,11 +94,63 @@ def attach_masks_to_dataset(Sv: xr.Dataset, masks: [xr.Dataset]) -> xr.Dataset:
     Expected Output:
     - Sv with extra variables containing the masks, named mask_[mask_type]
     """
-    for mask in masks:
-        Sv = attach_mask_to_dataset(Sv, mask)
+    # all the masks are assigned at once, rather than building a new dataset per mask
+    named_masks = {"mask_" + mask.attrs["mask_type"]: mask for mask in masks}
+    Sv = Sv.assign(named_masks)
+    for mask_name, mask in named_masks.items():
+        Sv[mask_name].attrs = mask.attrs
     return Sv
 
 
+def pack_masks(masks: [xr.DataArray]) -> xr.DataArray:
+    """
+    Packs up to 8 boolean masks of the same shape into the bits of a single uint8 mask,
+    so that they take one byte per value together instead of one byte each
+
+    Parameters:
+    - masks (xarray.DataArray[]): masks to be packed, with a mask_type attribute
+
+    Returns:
+    - xarray.DataArray: uint8 mask where bit i holds the i-th mask,
+    with the mask types in the mask_types attribute, in bit order
+
+    Example:
+        >>> mask_bits = pack_masks(masks)
+        >>> unpack_mask(mask_bits, "impulse")
+    """
+    if not masks:
+        raise ValueError("No masks to pack.")
+    if len(masks) > 8:
+        raise ValueError("At most 8 masks can be packed into one uint8 mask.")
+
+    mask_bits = None
+    for bit, mask in enumerate(masks):
+        mask_bit = mask.astype(np.uint8) << bit
+        mask_bits = mask_bit if mask_bits is None else mask_bits | mask_bit
+    mask_bits.attrs = {"mask_types": [mask.attrs["mask_type"] for mask in masks]}
+    return mask_bits
+
+
+def unpack_mask(mask_bits: xr.DataArray, mask_type: str) -> xr.DataArray:
+    """
+    Extracts one boolean mask from a mask packed by pack_masks
+
+    Parameters:
+    - mask_bits (xarray.DataArray): uint8 mask returned by pack_masks
+    - mask_type (str): type of the mask to extract, one of mask_bits.attrs["mask_types"]
+
+    Returns:
+    - xarray.DataArray: the boolean mask
+
+    Example:
+        >>> unpack_mask(Sv_mask["mask_bits"], "transient")
+    """
+    bit = list(mask_bits.attrs["mask_types"]).index(mask_type)
+    mask = ((mask_bits >> bit) & 1).astype(bool)
+    mask.attrs = {"mask_type": mask_type}
+    return mask
+
+
 def tfc(mask: xr.DataArray):
     """
     Counts true and false values in a xarray (usually a mask)
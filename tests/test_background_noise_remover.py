@@ -3,7 +3,10 @@ import pandas as pd
 import pytest
 import xarray as xr
 
-from oceanstream.denoise.background_noise_remover import apply_remove_background_noise
+from oceanstream.denoise.background_noise_remover import (
+    _default_range_sample_num,
+    apply_remove_background_noise,
+)
 
 
 def test_apply_remove_background_noise(enriched_ek60_Sv):
@@ -57,3 +60,18 @@ def test_background_noise_value_error():
         print("Function executed successfully.")
     except ValueError as e:
         print(f"Error caught: {e}")
+
+
+def test_default_range_sample_num_boundary():
+    # 89 samples per 10 m, a spacing whose mean difference is not exact in floating point
+    echo_range = np.linspace(0, 10 / 89 * 99, 100)
+    ds_Sv = xr.Dataset(
+        {"echo_range": (["channel", "ping_time", "range_sample"], echo_range[None, None, :])}
+    )
+    assert _default_range_sample_num(ds_Sv["echo_range"]) == 89
+
+    # the same with a missing sample, which takes the mean of the differences
+    echo_range = echo_range.copy()
+    echo_range[50] = np.nan
+    ds_Sv["echo_range"] = (["channel", "ping_time", "range_sample"], echo_range[None, None, :])
+    assert _default_range_sample_num(ds_Sv["echo_range"]) == 89
@@ -1,7 +1,14 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from oceanstream.denoise import noise_masks
 from oceanstream.denoise.noise_masks import OCEANSTREAM_MASK_PARAMETERS
 from oceanstream.denoise.noise_masks import (
+    clear_mask_cache,
     create_attenuation_mask,
     create_impulse_mask,
+    create_mask,
     create_seabed_mask,
     create_transient_mask,
     create_multiple_masks,
@@ -94,9 +101,76 @@ def test_seabed(enriched_ek60_Sv):
     assert mask["channel"].shape == (3,)
 
 
+def test_seabed_without_split_beam_angles(enriched_ek60_Sv):
+    source_Sv = enriched_ek60_Sv.drop_vars(
+        ["angle_alongship", "angle_athwartship"], errors="ignore"
+    )
+    with pytest.warns(UserWarning, match="split-beam angles"):
+        mask = create_seabed_mask(
+            source_Sv,
+            method="blackwell",
+            parameters=TEST_MASK_PARAMETERS["false_seabed"]["params"],
+        )
+    # True keeps a sample, so the fallback mask removes nothing
+    assert mask.shape == source_Sv["Sv"].shape
+    assert mask.all()
+
+
 def test_create_masks(enriched_ek60_Sv):
     enriched_Sv = enriched_ek60_Sv
     Sv_mask = create_multiple_masks(enriched_Sv, TEST_MASK_PARAMETERS)
     assert Sv_mask["mask_seabed"].attrs["mask_type"] == "seabed"
     assert Sv_mask["mask_impulse"].attrs["parameters"] == ["thr=3", "m=3", "n=1"]
 
+
+
+def test_create_mask_cache(monkeypatch):
+    calls = []
+
+    def threshold_mask(Sv, parameters, method):
+        calls.append(method)
+        return Sv["Sv"] > parameters["thr"]
+
+    monkeypatch.setitem(noise_masks.MASK_FUNCTIONS, "impulse", threshold_mask)
+    source_Sv = xr.Dataset({"Sv": (["channel", "ping_time"], np.arange(12.0).reshape(3, 4))})
+    params = {"method": "ryan", "params": {"thr": 5}}
+
+    # masks are created again unless the cache is asked for
+    create_mask(source_Sv, "impulse", params)
+    create_mask(source_Sv, "impulse", params)
+    assert len(calls) == 2
+
+    for dataset in [source_Sv, source_Sv.chunk({"ping_time": 2})]:
+        calls.clear()
+        mask = create_mask(dataset, "impulse", params, cache=True)
+        assert create_mask(dataset, "impulse", params, cache=True).equals(mask)
+        assert len(calls) == 1
+
+    # dask-backed datasets with the same data share their masks
+    create_mask(source_Sv.chunk({"ping_time": 2}), "impulse", params, cache=True)
+    assert len(calls) == 1
+
+    clear_mask_cache()
+    create_mask(source_Sv, "impulse", params, cache=True)
+    assert len(calls) == 2
+
+
+def test_create_multiple_masks_prefilter_seabed(monkeypatch):
+    # transient noise above 8 dB and impulse noise at 2 dB, True keeps a sample
+    monkeypatch.setitem(noise_masks.MASK_FUNCTIONS, "transient", lambda Sv, p, m: Sv["Sv"] <= 8)
+    monkeypatch.setitem(noise_masks.MASK_FUNCTIONS, "impulse", lambda Sv, p, m: Sv["Sv"] != 2)
+    # a seabed mask keeping the samples the detector was given
+    monkeypatch.setitem(noise_masks.MASK_FUNCTIONS, "seabed", lambda Sv, p, m: Sv["Sv"].notnull())
+    source_Sv = xr.Dataset({"Sv": (["channel", "ping_time"], np.arange(12.0).reshape(3, 4))})
+    params = {
+        mask_type: {"method": "test", "params": {}}
+        for mask_type in ["seabed", "transient", "impulse"]
+    }
+
+    Sv_mask = create_multiple_masks(source_Sv, params, prefilter_seabed=True)
+    expected = (source_Sv["Sv"] <= 8) & (source_Sv["Sv"] != 2)
+    assert (Sv_mask["mask_seabed"] == expected).all()
+    assert list(Sv_mask.data_vars) == ["Sv", "mask_seabed", "mask_transient", "mask_impulse"]
+
+    # without the prefilter the seabed detector sees all the samples
+    assert create_multiple_masks(source_Sv, params)["mask_seabed"].all()
@@ -1,16 +1,27 @@
 import os
+import struct
 import urllib.request
+from datetime import datetime, timedelta
+
 import pytest
 
 from oceanstream.echodata.raw_handler import (
+    clear_read_cache,
     convert_raw_files,
+    convert_raw_files_iter,
     file_finder,
     file_integrity_checking,
+    file_integrity_checking_batch,
+    iter_raw_files,
+    metadata_from_ed,
+    process_raw_files_iter,
     read_processed_files,
     read_raw_files,
+    read_raw_files_lazy,
     split_files,
     detect_sonar_model,
 )
+from oceanstream.echodata import raw_handler
 from tests.conftest import TEST_DATA_FOLDER
 
 
@@ -36,6 +47,34 @@ def test_file_finder(ftp_data):
         file_finder(12345)
 
 
+def test_file_finder_suffix_match(tmp_path):
+    for name in ["a.raw", "b.rawdata", "c.raw.bak", "d.nc"]:
+        (tmp_path / name).touch()
+    (tmp_path / "e.raw").mkdir()
+    raw_backups = tmp_path / "raw_backups.raw"
+    raw_backups.mkdir()
+    (raw_backups / "f.nc").touch()
+
+    # only files whose name ends with the extension are found
+    assert file_finder(str(tmp_path), "raw") == [str(tmp_path / "a.raw")]
+    paths = [str(tmp_path / "a.raw"), str(tmp_path / "c.raw.bak"), str(raw_backups / "f.nc")]
+    assert file_finder(paths, "raw") == [str(tmp_path / "a.raw")]
+
+    # paths that are not directories are rejected
+    with pytest.raises(ValueError):
+        file_finder(str(tmp_path / "a.raw"), "raw")
+
+
+def test_file_finder_zarr_symlinks(tmp_path):
+    zarr_root = tmp_path / "data" / "a.zarr"
+    zarr_root.mkdir(parents=True)
+    (zarr_root / ".zgroup").touch()
+    (tmp_path / "data" / "b.zarr").symlink_to(zarr_root, target_is_directory=True)
+
+    # symlinked directories are not followed, as with os.walk
+    assert file_finder(str(tmp_path / "data"), "zarr") == [str(zarr_root)]
+
+
 def test_file_integrity_checking(ftp_data):
     found_files = file_finder(ftp_data)
     # Test with a valid raw echo sounder file
@@ -63,6 +102,79 @@ def test_file_integrity_checking(ftp_data):
         file_integrity_checking(unsupported_file)
 
 
+def test_file_integrity_checking_date_from_file_name():
+    # the date of processed files is taken from the file name only
+    result = file_integrity_checking("/data/JR161-D20230509-T100645.nc")
+    assert result["campaign_id"] == "JR161"
+    assert result["date"] == datetime(2023, 5, 9, 10, 6, 45)
+    assert result["file_integrity"] == True
+
+    # Test with an invalid date and without any date
+    for file_name in ["/data/JR161-D20231309-T100645.nc", "/data/JR161.nc"]:
+        result = file_integrity_checking(file_name)
+        assert result["date"] is None
+        assert result["file_integrity"] == False
+
+
+def test_file_integrity_checking_remote_url():
+    # remote URLs are kept as they are instead of being made absolute
+    url = "s3://bucket/JR161-D20230509-T100645.nc"
+    result = file_integrity_checking(url)
+    assert result["file_path"] == url
+    assert result["campaign_id"] == "JR161"
+    assert result["date"] == datetime(2023, 5, 9, 10, 6, 45)
+
+
+def test_storage_options():
+    # the options given by the caller are applied over the defaults of the URL scheme
+    options = raw_handler._storage_options("s3://bucket/a.raw", {"anon": True})
+    assert options["anon"] is True
+    assert options["default_block_size"] == raw_handler.REMOTE_BLOCK_SIZE
+    assert "anon" not in raw_handler._storage_options("s3://bucket/a.raw")
+    assert raw_handler._storage_options("memory://a.raw", {"anon": True}) == {"anon": True}
+    assert raw_handler._storage_options("/data/a.raw", {"anon": True}) is None
+
+
+def test_metadata_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def read_metadata(file_path):
+        calls.append(file_path)
+        return None if file_path.endswith("bad.raw") else {"campaign_id": "JR161"}
+
+    cached = raw_handler._cache_on_disk(read_metadata)
+    good_file, bad_file = tmp_path / "good.raw", tmp_path / "bad.raw"
+    good_file.write_bytes(b"good")
+    bad_file.write_bytes(b"bad")
+
+    # the cache is off by default
+    assert raw_handler.METADATA_CACHE_PATH is None
+    cached(str(good_file))
+    cached(str(good_file))
+    assert len(calls) == 2
+
+    cache_path = tmp_path / "cache" / "metadata_cache.sqlite"
+    monkeypatch.setattr(raw_handler, "METADATA_CACHE_PATH", str(cache_path))
+    calls.clear()
+    assert cached(str(good_file)) == cached(str(good_file)) == {"campaign_id": "JR161"}
+    assert calls == [str(good_file)]
+    assert cache_path.exists()
+
+    # files that could not be read are read again
+    assert cached(str(bad_file)) is None
+    assert cached(str(bad_file)) is None
+    assert calls.count(str(bad_file)) == 2
+
+
+def test_file_integrity_checking_batch(ftp_data):
+    found_files = file_finder(ftp_data, "raw")[:3]
+    results = file_integrity_checking_batch(found_files, max_workers=2)
+    assert results == [file_integrity_checking(f) for f in found_files]
+
+    # Test with an empty list
+    assert file_integrity_checking_batch([]) == []
+
+
 def test_read_raw_files(ftp_data):
     # Test with a list of valid file dictionaries
     found_files = file_finder(ftp_data, "raw")
@@ -72,11 +184,38 @@ def test_read_raw_files(ftp_data):
     assert len(datasets) == 16
     # Additional assertions can be added based on expected dataset properties
 
+    # Test opening the files in a thread pool
+    datasets = read_raw_files(file_dicts[:4], max_workers=2)
+    assert len(datasets) == 4
+
     # Test with an empty list
     datasets = read_raw_files([])
     assert len(datasets) == 0
 
 
+def test_iter_raw_files(ftp_data):
+    found_files = file_finder(ftp_data, "raw")
+    file_dicts = [file_integrity_checking(f) for f in found_files[:3]]
+
+    datasets = list(iter_raw_files(file_dicts))
+    assert len(datasets) == 3
+
+    # Test with an empty list
+    assert list(iter_raw_files([])) == []
+
+
+def test_read_raw_files_lazy(ftp_data):
+    import dask
+
+    found_files = file_finder(ftp_data, "raw")
+    file_dicts = [file_integrity_checking(f) for f in found_files[:2]]
+
+    delayed_files = read_raw_files_lazy(file_dicts)
+    assert len(delayed_files) == 2
+    datasets = dask.compute(*delayed_files)
+    assert len(datasets) == 2
+
+
 def test_read_processed_files(ftp_data):
     # Test with a list of valid processed file paths
     found_files = file_finder(ftp_data, "raw")
@@ -87,6 +226,18 @@ def test_read_processed_files(ftp_data):
     assert len(datasets) == 3
     # Additional assertions can be added based on expected dataset properties
 
+    # Test opening the files in a thread pool
+    assert len(read_processed_files(file_paths, max_workers=2)) == 3
+
+    # Test that files are opened again unless the cache is asked for
+    assert read_processed_files(file_paths)[0] is not datasets[0]
+
+    # Test that unchanged files are not opened again until the cache is cleared
+    cached = read_processed_files(file_paths, cache=True)
+    assert read_processed_files(file_paths, cache=True)[0] is cached[0]
+    clear_read_cache()
+    assert read_processed_files(file_paths, cache=True)[0] is not cached[0]
+
     # Test with an empty list
     datasets = read_processed_files([])
     assert len(datasets) == 0
@@ -109,6 +260,22 @@ def test_convert_raw_files(ftp_data):
         assert os.path.exists(file)
         assert file.endswith(".zarr")
 
+    # Test conversion in worker processes
+    converted_files = convert_raw_files(
+        file_dicts, save_path=TEST_DATA_FOLDER, save_file_type="nc", max_workers=2
+    )
+    assert len(converted_files) == 3
+    for file in converted_files:
+        assert os.path.exists(file)
+
+    # Test with concurrent writes
+    converted_files = convert_raw_files(
+        file_dicts, save_path=TEST_DATA_FOLDER, save_file_type="zarr", write_workers=2
+    )
+    assert len(converted_files) == 3
+    for file in converted_files:
+        assert os.path.exists(file)
+
     # Test with an unsupported save file type
     with pytest.raises(
             Exception
@@ -123,6 +290,33 @@ def test_convert_raw_files(ftp_data):
         os.remove(file)
 
 
+def test_convert_raw_files_iter(ftp_data):
+    found_files = file_finder(ftp_data, "raw")
+    file_dicts = [file_integrity_checking(f) for f in found_files[:2]]
+
+    converted = list(
+        convert_raw_files_iter(file_dicts, save_path=TEST_DATA_FOLDER, save_file_type="nc")
+    )
+    assert len(converted) == 2
+    for (file, ed), file_dict in zip(converted, file_dicts):
+        assert os.path.exists(file)
+        file_info = metadata_from_ed(file, ed)
+        assert file_info["campaign_id"] == file_integrity_checking(file)["campaign_id"]
+        assert file_info["sonar_model"] == file_dict["sonar_model"]
+
+
+def test_process_raw_files_iter(ftp_data):
+    found_files = file_finder(ftp_data, "raw")[:2]
+
+    converted_files_info = list(
+        process_raw_files_iter(iter(found_files), save_path=TEST_DATA_FOLDER, save_file_type="nc")
+    )
+    assert len(converted_files_info) == 2
+    for file_info in converted_files_info:
+        assert os.path.exists(file_info["file_path"])
+        assert file_info["file_integrity"] == True
+
+
 def test_split_files(ftp_data):
     # Test with a list of similar file dictionaries
     found_files = file_finder(ftp_data, "raw")
@@ -145,6 +339,49 @@ def test_split_files(ftp_data):
         grouped_files = split_files([])
 
 
+def test_split_files_time_gaps():
+    start = datetime(2023, 5, 9, 10, 6, 45)
+    offsets = [0, 10, 60, 20]
+    file_dicts = [
+        {
+            "file_path": f"/path/to/JR161-{i}.raw",
+            "campaign_id": "JR161",
+            "date": start + timedelta(minutes=offset),
+            "file_integrity": True,
+            "sonar_model": "EK60",
+        }
+        for i, offset in enumerate(offsets)
+    ]
+
+    grouped_files = split_files(file_dicts)
+    # the files are grouped in date order, whatever the order of the list
+    assert [len(group) for group in grouped_files] == [3, 1]
+    assert grouped_files[0] == [file_dicts[0], file_dicts[1], file_dicts[3]]
+    assert grouped_files[1] == [file_dicts[2]]
+
+
+def test_split_files_interleaved_campaigns():
+    start = datetime(2023, 5, 9, 10, 6, 45)
+    file_dicts = [
+        {
+            "file_path": f"/path/to/{campaign_id}{i}.raw",
+            "campaign_id": campaign_id,
+            "date": start + timedelta(minutes=i),
+            "file_integrity": True,
+            "sonar_model": sonar_model,
+        }
+        for i in range(3)
+        for campaign_id, sonar_model in [("A", "EK60"), ("B", "EK80")]
+    ]
+
+    # files of two campaigns recorded at the same time form one group per campaign
+    grouped_files = split_files(file_dicts)
+    assert [[f_i["file_path"][-6:-4] for f_i in group] for group in grouped_files] == [
+        ["A0", "A1", "A2"],
+        ["B0", "B1", "B2"],
+    ]
+
+
 def test_detect_sonar_model_ek60(ftp_data):
     # Test with a valid raw echo sounder file
     found_files = file_finder(ftp_data, "raw")
@@ -166,3 +403,29 @@ def test_detect_sonar_model_ek80(ftp_data):
     sonar_model = detect_sonar_model(local_path)
 
     assert sonar_model == "EK80"
+
+
+def test_detect_sonar_model_unreadable_header(tmp_path):
+    # random bytes and a configuration datagram cut short
+    for name, content in [
+        ("JR161-D20230509-T100645.raw", os.urandom(256)),
+        ("JR161-D20230509-T110645.raw", b"\x00\x01\x00\x00CON0" + b"\x00" * 10),
+    ]:
+        file_path = tmp_path / name
+        file_path.write_bytes(content)
+        assert detect_sonar_model(str(file_path)) is None
+
+
+def test_file_integrity_checking_unreadable_header(tmp_path):
+    # an EK60 configuration datagram, followed by a file of the campaign with a corrupt header
+    con0 = struct.pack("=4sLL128s128s128s30s98sl", b"CON0", 0, 0, b"JR161", b"", b"ER60", b"", b"", 1)
+    first_file = tmp_path / "JR161-D20230509-T100645.raw"
+    first_file.write_bytes(struct.pack("=l", len(con0)) + con0)
+    second_file = tmp_path / "JR161-D20230509-T110645.raw"
+    second_file.write_bytes(os.urandom(256))
+
+    # the result for a file does not depend on the files checked before it
+    assert file_integrity_checking(str(first_file))["sonar_model"] == "EK60"
+    result = file_integrity_checking(str(second_file))
+    assert result["sonar_model"] is None
+    assert result["campaign_id"] == "JR161"
@@ -1,7 +1,11 @@
 import pytest
 from pydantic import ValidationError
 
-from oceanstream.echodata.sv_computation import ComputeSVParams, SupportedSonarModelsForSv
+from oceanstream.echodata.sv_computation import (
+    ComputeSVParams,
+    SupportedSonarModelsForSv,
+    compute_sv,
+)
 
 
 def test_valid_sonar_models():
@@ -78,3 +82,15 @@ def test_cal_params(ed_ek_60_for_Sv, ed_ek_80_for_Sv):
         # Test with incorrect cal_params
         with pytest.raises(ValueError):
             ComputeSVParams(echodata=ed, cal_params="incorrect_value")
+
+
+def test_compute_sv_invalid_params(ed_ek_60_for_Sv):
+    # compute_sv applies the same checks as ComputeSVParams
+    with pytest.raises(ValueError):
+        compute_sv({"sonar_model": "incorrect"})
+    with pytest.raises(ValueError):
+        compute_sv(ed_ek_60_for_Sv, encode_mode="INVALID_MODE")
+    with pytest.raises(ValueError):
+        compute_sv(ed_ek_60_for_Sv, waveform_mode="INVALID_MODE")
+    with pytest.raises(ValueError):
+        compute_sv(ed_ek_60_for_Sv, env_params="incorrect_value")
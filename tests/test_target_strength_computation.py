@@ -8,3 +8,17 @@ def test_ctarget_strength_computation(ed_ek_60_for_Sv):
     TS = target_strength_computation.compute_target_strength(ed_ek_60_for_Sv, encode_mode="power")
     val = np.nanmean(TS["TS"].values)
     assert val == pytest.approx(-68.06057158474684, 0.0001)
+
+
+def test_target_strength_computation_invalid_params(ed_ek_60_for_Sv):
+    # compute_target_strength applies the same checks as ComputeTSParams
+    with pytest.raises(ValueError):
+        target_strength_computation.compute_target_strength({"sonar_model": "incorrect"})
+    with pytest.raises(ValueError):
+        target_strength_computation.compute_target_strength(
+            ed_ek_60_for_Sv, encode_mode="INVALID_MODE"
+        )
+    with pytest.raises(ValueError):
+        target_strength_computation.compute_target_strength(
+            ed_ek_60_for_Sv, env_params="incorrect_value"
+        )
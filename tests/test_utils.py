@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 from oceanstream.denoise.noise_masks import create_seabed_mask
 from oceanstream.echodata.sv_computation import compute_sv
 from oceanstream.exports.plot import plot_all_channels
@@ -84,6 +86,34 @@ def test_tfc():
     assert res == (2, 1)
 
 
+def test_pack_masks():
+    masks = [
+        xr.DataArray(data=[True, False, True], dims=["x"], attrs={"mask_type": "transient"}),
+        xr.DataArray(data=[False, False, True], dims=["x"], attrs={"mask_type": "impulse"}),
+    ]
+    mask_bits = pack_masks(masks)
+    assert mask_bits.dtype == np.uint8
+    assert mask_bits.attrs["mask_types"] == ["transient", "impulse"]
+    for mask in masks:
+        unpacked = unpack_mask(mask_bits, mask.attrs["mask_type"])
+        assert unpacked.dtype == bool
+        assert (unpacked == mask).all()
+
+    # there must be between 1 and 8 masks
+    with pytest.raises(ValueError):
+        pack_masks([])
+    with pytest.raises(ValueError):
+        pack_masks(masks * 5)
+
+
+def test_as_bool_mask():
+    mask = xr.DataArray(data=[1, 0, 1], dims=["x"])
+    assert (as_bool_mask(mask) == mask.astype(bool)).all()
+    assert as_bool_mask(mask).dtype == bool
+    float_mask = xr.DataArray(data=[1.0, np.nan], dims=["x"])
+    assert as_bool_mask(float_mask).dtype == float_mask.dtype
+
+
 def test_plotting(ed_ek_60_for_Sv):
     current_directory = os.path.dirname(os.path.abspath(__file__))
     TEST_DATA_FOLDER = os.path.join(current_directory, "..", "test_data")